@@ -1,109 +1,28 @@
+import uuid
 import streamlit as st
-import os
+
+# Antes de pandas: o primeiro marco mede as importações da página
+from config.inicializacao import registrar_marco
 import pandas as pd
-from config.utils import *
-import config.config_interface as config_interface
 import numpy as np
+from config.utils import (
+    FORMATOS_CUPONS,
+    formatadores_exibicao,
+    formatar_float,
+    formatar_inteiro,
+    formatar_moeda,
+)
+from config.dados import carregar_catalogo_promocoes, versao_promocao
+from config.prefetch import obter_prefetcher
+from config.relatorios import FATOR_META_LUCRO
+from config.validacao import REGRAS
+
+registrar_marco("importacoes")
 
 # Configuração inicial da aplicação
 st.set_page_config(page_title="Análise Tabloide Leve +", page_icon=":bar_chart:", layout="wide")
 
 
-def carregar_dados():
-    """Carrega os dados do relatório tratado."""
-    return carregar_arquivo_csv(config_interface.CAMINHO_RELATORIO)
-
-
-def carregar_dados_mensais(data_inicial, data_final):
-    """Carrega dinamicamente os arquivos mensais conforme o período selecionado."""
-    meses = pd.date_range(start=data_inicial, end=data_final, freq="MS").strftime("%m")
-    arquivos_mensais = []
-    for mes in meses:
-        caminho_arquivo = os.path.join(config_interface.PASTA_TRATADO, f"dado_final-{mes}.csv")
-        if os.path.exists(caminho_arquivo):
-            arquivos_mensais.append(carregar_arquivo_csv(caminho_arquivo))
-    return pd.concat(arquivos_mensais, ignore_index=True) if arquivos_mensais else pd.DataFrame()
-
-
-def calcular_custos_encarte(dados_filtrados):
-
-    # Filtra todas as promoções relacionadas ao mesmo período
-    filtrados = dados_filtrados
-
-    # Dicionário para armazenar os preços por SKU e loja
-    preco_por_sku_loja = {}
-
-    for _, linha in filtrados.iterrows():
-        sku = linha["SKU"]
-        preco_promocional = linha["Preco Venda Promocao"]
-        loja = linha["Loja"]
-
-        if sku not in preco_por_sku_loja:
-            preco_por_sku_loja[sku] = {}
-
-        preco_por_sku_loja[sku][loja] = {
-            "preco_promocional": preco_promocional,
-        }
-
-    # Verifica se todos os SKUs têm preços promocionais iguais entre as lojas
-    modelo_unico = True
-    for sku, lojas in preco_por_sku_loja.items():
-        preco_promocional_comum = list(lojas.values())[0]["preco_promocional"]
-
-        for loja, precos in lojas.items():
-            if precos["preco_promocional"] != preco_promocional_comum:
-                modelo_unico = False
-                break
-
-        if not modelo_unico:
-            break
-
-    # Define o custo com base no modelo identificado
-    custo = 3600 if modelo_unico else 6400
-    return custo
-
-
-def gerar_insights(dados_filtrados, custo_encarte):
-    # Quantidade de cupons ativados
-    quant_cupons_ativados = dados_filtrados["Num.Cupom"].nunique()
-
-    # Quantidade de itens unicos ativados
-    quant_itens_unicos_ativados = dados_filtrados["Familia"].nunique()
-
-    # Quantidade de itens vendidos
-    quant_itens_vendidos = dados_filtrados["Quantidade Comprada"].sum()
-
-    # Calcular desconto total
-    desconto_total = dados_filtrados["Desconto Total"].sum()
-
-    # Calcular a receita bruta
-    receita_bruta = dados_filtrados["Quantidade Comprada"] * dados_filtrados["Preco Venda Promocao"]
-    receita_bruta_total = receita_bruta.sum()
-
-    # Calcular Lucro Bruto (dado nao totalmente correto)
-    lucro_bruto = (
-        dados_filtrados["Preco Venda Promocao"] - dados_filtrados["Custo Produto"]
-    ) * dados_filtrados["Quantidade Comprada"]
-    lucro_bruto_total = lucro_bruto.sum()
-
-    # Lucro Liquido
-    lucro_liquido = lucro_bruto_total - custo_encarte - desconto_total
-
-    # Custo total
-    custo_total = desconto_total + custo_encarte
-
-    return (
-        quant_cupons_ativados,
-        quant_itens_unicos_ativados,
-        quant_itens_vendidos,
-        desconto_total,
-        receita_bruta_total,
-        lucro_bruto_total,
-        lucro_liquido,
-        custo_total,
-    )
-
-
 # Dicionário com os valores mínimos para destacar cada coluna
 limiares = {
     "Quantidade Comprada": 2,
@@ -113,34 +32,26 @@ limiares = {
 }
 
 
-# Função para aplicar cores com base no valor da célula
-def highlight_values(val, limiar):
-    try:
-        # Garante que o valor é numérico antes da comparação
-        if isinstance(val, (int, float)) and val >= limiar:
-            return "background-color: yellow; color: black; font-weight: bold;"
-    except:
-        pass
-    return ""
-
+ESTILO_DESTAQUE = "background-color: yellow; color: black; font-weight: bold;"
 
-# Interface do Streamlit
-st.title("Análise de Tabloide - Leve Mais")
 
-# Carregar dados do relatório tratado
-relatorio_tratado = carregar_dados()
-# normalizar as colunas
-relatorio_tratado["Nome Promocao"] = relatorio_tratado["Nome Promocao"].astype(str)
+# Calcula as cores de todas as células de uma vez, a partir dos valores numéricos
+def destacar_valores(dados):
+    estilos = pd.DataFrame("", index=dados.index, columns=dados.columns)
+    for coluna, limiar in limiares.items():
+        estilos[coluna] = np.where(dados[coluna] >= limiar, ESTILO_DESTAQUE, "")
+    return estilos
 
-relatorio_tratado["SKU"] = relatorio_tratado["SKU"].astype(str)
 
+# Interface do Streamlit
+st.title("Análise de Tabloide - Leve Mais")
 
-relatorio_tratado["Data Inicial"] = pd.to_datetime(relatorio_tratado["Data Inicial"])
-relatorio_tratado["Data Final"] = pd.to_datetime(relatorio_tratado["Data Final"])
-
+# Catálogo de promoções pré-calculado (snapshot publicado junto com o relatório)
+catalogo_promocoes = carregar_catalogo_promocoes()
+registrar_marco("catalogo")
 
-data_minima = relatorio_tratado["Data Inicial"].min()
-data_maxima = relatorio_tratado["Data Final"].max()
+data_minima = catalogo_promocoes["Data Inicial"].min()
+data_maxima = catalogo_promocoes["Data Final"].max()
 
 # Seleção de período
 st.subheader("Seleção de Período de Promoção")
@@ -164,40 +75,12 @@ data_inicial = pd.to_datetime(data_inicial)
 data_final = pd.to_datetime(data_final)
 
 # Filtrar promoções que COMEÇAM e TERMINAM dentro do período selecionado
-promoções_no_periodo = relatorio_tratado[
-    (relatorio_tratado["Data Inicial"] >= data_inicial)
-    & (relatorio_tratado["Data Final"] <= data_final)
+promoções_no_periodo = catalogo_promocoes[
+    (catalogo_promocoes["Data Inicial"] >= data_inicial)
+    & (catalogo_promocoes["Data Final"] <= data_final)
 ]
 # Criar um dropdown com promoções agrupadas pelo período (removendo a loja)
 if not promoções_no_periodo.empty:
-    promoções_no_periodo["Nome Agrupado"] = promoções_no_periodo["Nome Promocao"].str.extract(
-        r"^(TABLOIDE \d+ A \d+)"
-    )
-    # Adicionar a data inicial e final no formato dd/mm
-    promoções_no_periodo["Data Inicial Formatada"] = promoções_no_periodo[
-        "Data Inicial"
-    ].dt.strftime(
-        "%d/%m"
-    )  # Ex: "29/07"
-    promoções_no_periodo["Data Final Formatada"] = promoções_no_periodo["Data Final"].dt.strftime(
-        "%d/%m"
-    )  # Ex: "10/08"
-    promoções_no_periodo["Ano"] = promoções_no_periodo["Data Inicial"].dt.year  # Ano da promoção
-
-    # Criar a nova coluna com o formato desejado
-    promoções_no_periodo["Mês Formatado"] = (
-        promoções_no_periodo["Data Inicial Formatada"]
-        + " A "
-        + promoções_no_periodo["Data Final Formatada"]
-        + " - "
-        + promoções_no_periodo["Ano"].astype(str)
-    )
-
-    # Agora, use a nova coluna "Mês Formatado" para exibir na selectbox
-    promoções_no_periodo["Nome Agrupado com Mês"] = (
-        promoções_no_periodo["Nome Agrupado"] + " - " + promoções_no_periodo["Mês Formatado"]
-    )
-
     # Cria a lista de promoções únicas para o selectbox, usando 'Nome Agrupado com Mês'
     promoções_unicas = promoções_no_periodo["Nome Agrupado com Mês"].dropna().unique()
 
@@ -213,30 +96,34 @@ if not promoções_no_periodo.empty:
     data_inicial_promocao = dados_promocao_selecionada["Data Inicial"].min()
     data_final_promocao = dados_promocao_selecionada["Data Final"].max()
 
-    # Carregar apenas os cupons do período correto
-    dados_mensais = carregar_dados_mensais(data_inicial, data_final)
-
-    dados_mensais["Data Cupom"] = pd.to_datetime(dados_mensais["Data Cupom"])
-
-    dados_filtrados = dados_mensais[
-        dados_mensais["Data Cupom"].between((data_inicial_promocao), (data_final_promocao))
+    # Período de cada promoção, na mesma ordem do selectbox
+    periodos_promocoes = promoções_no_periodo.groupby("Nome Agrupado", observed=True).agg(
+        inicio=("Data Inicial", "min"), fim=("Data Final", "max")
+    )
+    chaves_promocoes = [
+        tuple(periodos_promocoes.loc[nome.split(" - ")[0]]) for nome in promoções_unicas
     ]
 
-    dados_filtrados["SKU"] = dados_filtrados["SKU"].astype(str)
-    dados_filtrados["Num.Cupom"] = dados_filtrados["Num.Cupom"].astype(str)
-
-    # dados mensais para calcular o delta
-
-    # Criar coluna de destaque (🔴 ou 🟢)
-    dados_filtrados["Destaque"] = np.where(dados_filtrados["Desconto Unitario"] > 5, "🔴", "🟢")
+    # Carregar apenas os cupons do período correto (do cache, se já pré-carregados)
+    prefetcher = obter_prefetcher()
+    analise_promocao = prefetcher.obter((data_inicial_promocao, data_final_promocao))
+
+    # Pré-carregar a promoção anterior e a próxima enquanto o usuário lê esta
+    # (identificando a sessão, para não cancelar os pré-carregamentos de outras)
+    if "id_sessao" not in st.session_state:
+        st.session_state["id_sessao"] = uuid.uuid4().hex
+    prefetcher.agendar_vizinhas(
+        chaves_promocoes,
+        list(promoções_unicas).index(nome_promocao_selecionada),
+        st.session_state["id_sessao"],
+    )
 
-    # Reorganizar para deixar "Destaque" como a primeira coluna
-    dados_filtrados = dados_filtrados[
-        ["Destaque"] + [col for col in dados_filtrados.columns if col != "Destaque"]
-    ]
+    # Somente leitura: em geral são visões do conjunto compartilhado entre as sessões
+    dados_filtrados = analise_promocao["cupons"]
 
     # if "dados_filtrados_promocao" not in st.session_state:
     st.session_state["dados_filtrados_promocao"] = dados_filtrados
+    st.session_state["agregados_promocao"] = analise_promocao["agregados"]
 
     # Função para alternar o estado do dataframe
     def alternar_tabela():
@@ -265,23 +152,11 @@ if not promoções_no_periodo.empty:
         #     hide_index=True,
         # )
 
-        # Criando o estilo do dataframe
+        # Criando o estilo do dataframe: textos no padrão brasileiro só na exibição
+        # (os valores seguem numéricos para ordenar) e destaques sobre esses valores
         styled_df = dados_filtrados.style.format(
-            {
-                "Desconto Total": "R$ {:.2f}",
-                "Ativacao Necessaria": "{:.0f}",
-                "Preco Venda Promocao": "R$ {:.2f}",
-                "Desconto Unitario": "R$ {:.2f}",
-                "Percentual Desconto": "{:.2f} %",
-                "Custo Produto": "R$ {:.2f}",
-                "Margem Produto": "{:.2f} %",
-                "Margem Promocao": "{:.2f} %",
-            }
-        )
-
-        ## Aplicando a coloração para os valores acima do limiar
-        for coluna, limiar in limiares.items():
-            styled_df = styled_df.applymap(lambda x: highlight_values(x, limiar), subset=[coluna])
+            formatadores_exibicao(dados_filtrados, FORMATOS_CUPONS), na_rep=""
+        ).apply(destacar_valores, axis=None)
 
         # Exibir o dataframe no Streamlit
         if st.session_state.mostrar_df:
@@ -290,18 +165,15 @@ if not promoções_no_periodo.empty:
                 use_container_width=True,
                 hide_index=True,
                 column_config={
-                    "Preco Venda Unidade": st.column_config.NumberColumn(
-                        "Preço Unitário", format="R$ %.2f"
-                    ),
-                    "Quantidade Comprada": st.column_config.NumberColumn(
-                        "Qtde Comprada", format="%.2f"
-                    ),
+                    "Preco Venda Unidade": st.column_config.NumberColumn("Preço Unitário"),
+                    "Quantidade Comprada": st.column_config.NumberColumn("Qtde Comprada"),
                     "Data Cupom": st.column_config.DateColumn("Dia da Compra", format="DD/MM/YYYY"),
                     "Familia": st.column_config.TextColumn("Item"),
                 },
             )
 
-        custo_encarte = calcular_custos_encarte(dados_filtrados)
+        custo_encarte = analise_promocao["custo_encarte"]
+        st.session_state["custo_encarte_promocao"] = custo_encarte
 
         (
             quant_cupons_ativados,
@@ -312,9 +184,9 @@ if not promoções_no_periodo.empty:
             lucro_bruto_total,
             lucro_liquido,
             custo_total,
-        ) = gerar_insights(dados_filtrados, custo_encarte)
+        ) = analise_promocao["insights"]
 
-        meta_lucro = custo_total * 1.2  # Garante que a meta é positiva
+        meta_lucro = custo_total * FATOR_META_LUCRO
 
         st.subheader("Insights da Promoção")
         col1, col2, col3, col4 = st.columns([0.5, 0.5, 0.5, 0.5])
@@ -359,8 +231,51 @@ if not promoções_no_periodo.empty:
                 f"O lucro líquido não cobriu o custo total. Faltaram {formatar_moeda(deficit)} ({abs((lucro_liquido / custo_total - 1)) * 100:.2f}%)."
             )
 
+        # Qualidade dos dados: contagens e anomalias calculadas na carga dos arquivos
+        qualidade = analise_promocao["qualidade"]
+        total_anomalias = len(qualidade["anomalias"])
+        with st.expander(
+            f"Qualidade dos Dados {'⚠️' if total_anomalias else '✅'} "
+            f"({formatar_inteiro(total_anomalias)} anomalias no período)"
+        ):
+            st.dataframe(
+                qualidade["contagem"].rename(columns=REGRAS),
+                use_container_width=True,
+                hide_index=True,
+            )
+            st.dataframe(
+                qualidade["anomalias"].assign(Regra=qualidade["anomalias"]["Regra"].map(REGRAS)),
+                use_container_width=True,
+                hide_index=True,
+            )
+
+        # Exportação da análise completa (cupons, lojas, famílias e indicadores)
+        st.subheader("Exportar Análise")
+        if st.button("Preparar Exportação 📦"):
+            # Importado só quando alguém exporta: não pesa na abertura da página
+            from config.exportacao import gerar_arquivo_exportacao
+
+            chave_promocao = (data_inicial_promocao, data_final_promocao)
+            with st.spinner("Gerando exportação..."):
+                # ZIP em disco, reaproveitado enquanto os arquivos de origem não mudarem
+                caminho_exportacao = gerar_arquivo_exportacao(
+                    chave_promocao,
+                    versao_promocao(*chave_promocao),
+                    lambda: prefetcher.obter(chave_promocao),
+                )
+            nome_arquivo = nome_promocao_selecionada.split(" - ")[0].replace(" ", "_")
+            with open(caminho_exportacao, "rb") as arquivo_exportacao:
+                st.download_button(
+                    "Baixar Análise (ZIP com CSVs) ⬇️",
+                    data=arquivo_exportacao,
+                    file_name=f"{nome_arquivo}.zip",
+                    mime="application/zip",
+                )
+
     else:
         st.warning("Nenhum cupom encontrado para o período selecionado.")
 
 else:
     st.warning("Nenhuma promoção disponível no período selecionado.")
+
+registrar_marco("pagina")
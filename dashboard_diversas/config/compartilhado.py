@@ -0,0 +1,174 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+# Versão do formato em disco; mudar invalida os quadros já publicados
+VERSAO_FORMATO = 2
+
+# Segundos que uma versão substituída fica em disco antes de ser apagada
+IDADE_VERSAO_ANTIGA = 600
+
+
+def _caminho_coluna(pasta, indice, sufixo=""):
+    return os.path.join(pasta, f"{indice:03d}{sufixo}.npy")
+
+
+def _limpar_versoes_antigas(pasta_pai, idade_minima):
+    """Apaga as versões substituídas há mais de `idade_minima` segundos.
+
+    Uma versão substituída não é apagada na hora: outro processo pode estar no
+    meio de `abrir_quadro` sobre ela.
+    """
+    agora = time.time()
+    for nome in os.listdir(pasta_pai):
+        caminho = os.path.join(pasta_pai, nome)
+        if nome.startswith(".antigo-") and agora - os.path.getmtime(caminho) > idade_minima:
+            shutil.rmtree(caminho, ignore_errors=True)
+
+
+def salvar_quadro(df, pasta, versao):
+    """Publica o DataFrame como um arquivo .npy por coluna, para ser mapeado em memória.
+
+    Colunas numéricas e de data são gravadas como estão; colunas de texto viram
+    códigos inteiros mais a lista de categorias (e voltam como categóricas). A
+    pasta é escrita ao lado e renomeada no fim, então outros processos nunca
+    enxergam um quadro incompleto. Se outro processo ou thread já publicou esta
+    `versao`, nada é feito.
+    """
+    if _ler_metadados(pasta, versao) is not None:
+        return
+
+    pasta_pai = os.path.dirname(os.path.abspath(pasta))
+    os.makedirs(pasta_pai, exist_ok=True)
+    pasta_temporaria = tempfile.mkdtemp(dir=pasta_pai, prefix=".publicando-")
+
+    try:
+        tipos = []
+        for indice, coluna in enumerate(df.columns):
+            serie = df[coluna]
+            if pd.api.types.is_datetime64_dtype(serie):
+                tipos.append("data")
+                valores = serie.to_numpy(dtype="datetime64[ns]").view("int64")
+            elif pd.api.types.is_numeric_dtype(serie) or pd.api.types.is_bool_dtype(serie):
+                tipos.append("numero")
+                valores = serie.to_numpy()
+            else:
+                tipos.append("texto")
+                codigos, categorias = pd.factorize(serie)
+                # Códigos no menor tipo inteiro que o pandas usaria, para que
+                # `Categorical.from_codes` use o arquivo mapeado sem convertê-lo
+                valores = pd.Categorical.from_codes(codigos, categorias).codes
+                np.save(
+                    _caminho_coluna(pasta_temporaria, indice, "-categorias"),
+                    np.asarray(categorias, dtype=str),
+                )
+            np.save(_caminho_coluna(pasta_temporaria, indice), np.ascontiguousarray(valores))
+
+        metadados = {
+            "versao": VERSAO_FORMATO,
+            "origem": versao,
+            "linhas": len(df),
+            "colunas": [str(coluna) for coluna in df.columns],
+            "tipos": tipos,
+        }
+        with open(os.path.join(pasta_temporaria, "meta.json"), "w", encoding="utf-8") as arquivo:
+            json.dump(metadados, arquivo, ensure_ascii=False)
+
+        # Outro publicador pode ter terminado enquanto este escrevia
+        if _ler_metadados(pasta, versao) is not None:
+            shutil.rmtree(pasta_temporaria, ignore_errors=True)
+            return
+
+        # A versão antiga é afastada, não apagada: pode haver leitores nela
+        if os.path.isdir(pasta):
+            os.rename(pasta, tempfile.mkdtemp(dir=pasta_pai, prefix=".antigo-"))
+        os.rename(pasta_temporaria, pasta)
+    except OSError:
+        # Outro processo publicou primeiro ou o disco não é gravável: segue sem publicar
+        shutil.rmtree(pasta_temporaria, ignore_errors=True)
+
+    _limpar_versoes_antigas(pasta_pai, IDADE_VERSAO_ANTIGA)
+
+
+def _ler_metadados(pasta, versao):
+    try:
+        with open(os.path.join(pasta, "meta.json"), encoding="utf-8") as arquivo:
+            metadados = json.load(arquivo)
+    except (OSError, ValueError):
+        return None
+
+    if metadados["versao"] != VERSAO_FORMATO or metadados["origem"] != versao:
+        return None
+    return metadados
+
+
+def quadro_publicado(pasta, versao):
+    """Indica se há um quadro publicado e atual em `pasta`, sem mapear as colunas."""
+    return _ler_metadados(pasta, versao) is not None
+
+
+def abrir_quadro(pasta, versao):
+    """Abre um quadro publicado por `salvar_quadro`, ou None se não existir ou estiver velho.
+
+    As colunas numéricas e de data são visões somente leitura dos arquivos mapeados
+    (sem cópia: todos os processos compartilham as mesmas páginas de memória). As de
+    texto viram categóricas sobre os códigos mapeados; só as categorias são
+    carregadas em cada processo.
+    """
+    metadados = _ler_metadados(pasta, versao)
+    if metadados is None:
+        return None
+
+    colunas = {}
+    try:
+        for indice, (coluna, tipo) in enumerate(zip(metadados["colunas"], metadados["tipos"])):
+            valores = np.load(_caminho_coluna(pasta, indice), mmap_mode="r")
+            if tipo == "data":
+                colunas[coluna] = valores.view("datetime64[ns]")
+            elif tipo == "texto":
+                categorias = np.load(_caminho_coluna(pasta, indice, "-categorias")).astype(object)
+                # Os códigos continuam no arquivo mapeado; -1 é ausente
+                colunas[coluna] = pd.Categorical.from_codes(valores, categorias)
+            else:
+                colunas[coluna] = valores
+    except OSError:
+        # A pasta foi substituída por outro publicador durante a leitura
+        return None
+
+    return pd.DataFrame(colunas, columns=metadados["colunas"], copy=False)
+
+
+def coluna_mapeada(serie):
+    """Indica se os valores da coluna são uma visão de um arquivo mapeado por `abrir_quadro`."""
+    valores = serie.array
+    valores = valores.codes if isinstance(valores, pd.Categorical) else serie.to_numpy()
+    while isinstance(valores, np.ndarray):
+        if isinstance(valores, np.memmap):
+            return True
+        valores = valores.base
+    return False
+
+
+def abrir_ou_publicar(pasta, nomes, versao, carregar):
+    """Abre os quadros `nomes` publicados em `pasta`; se algum faltar ou estiver velho, gera todos.
+
+    `carregar()` devolve um dicionário nome -> DataFrame e só é chamado quando a
+    publicação não existe para esta `versao` (ex.: a data de modificação da origem).
+    Retorna o mesmo dicionário, com os quadros já mapeados em memória.
+    """
+    quadros = {nome: abrir_quadro(os.path.join(pasta, nome), versao) for nome in nomes}
+    if all(df is not None for df in quadros.values()):
+        return quadros
+
+    carregados = carregar()
+    for nome in nomes:
+        salvar_quadro(carregados[nome], os.path.join(pasta, nome), versao)
+
+    quadros = {nome: abrir_quadro(os.path.join(pasta, nome), versao) for nome in nomes}
+    # Sem publicação (ex.: disco somente leitura), usa os quadros carregados
+    return {nome: carregados[nome] if df is None else df for nome, df in quadros.items()}
@@ -1,3 +1,17 @@
 # Caminhos dos arquivos
 CAMINHO_RELATORIO = "data/tratado/2024/intermediario/relatorio/relatorio_tratado.csv"
 PASTA_TRATADO = "data/tratado/2024/final/"
+
+# Pré-carregamento das promoções vizinhas
+LIMITE_CACHE_PROMOCOES_MB = 256
+THREADS_PREFETCH = 2
+
+# Validação dos dados na carga
+PERCENTUAL_DESCONTO_MINIMO = 0
+PERCENTUAL_DESCONTO_MAXIMO = 50
+
+# Conjunto de dados publicado em arquivos .npy, mapeado em memória pelos processos
+PASTA_COMPARTILHADA = "data/compartilhado/2024/"
+
+# Pacotes ZIP de exportação gerados, um por promoção e versão dos arquivos
+PASTA_EXPORTACOES = "data/exportacoes/"
@@ -0,0 +1,385 @@
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+import config.config_interface as config_interface
+from config.compartilhado import abrir_ou_publicar, quadro_publicado
+from config.relatorios import agregar_lojas
+from config.utils import carregar_arquivo_csv
+from config.validacao import VERSAO_REGRAS, validar_cupons
+
+
+def _versao_publicada(*mtimes):
+    """Versão gravada no conjunto compartilhado: as datas de modificação das origens
+    e a versão das regras de carga (mudar o código também invalida a publicação)."""
+    return [*mtimes, VERSAO_REGRAS]
+
+
+def _ler_relatorio(caminho):
+    """Lê o CSV do relatório, com as datas das promoções já convertidas."""
+    relatorio = carregar_arquivo_csv(caminho)
+    for coluna in ["Data Inicial", "Data Final"]:
+        relatorio[coluna] = pd.to_datetime(relatorio[coluna])
+    return relatorio
+
+
+def carregar_dados():
+    """Carrega os dados do relatório tratado.
+
+    O relatório é lido do conjunto compartilhado (mapeado em memória); só o
+    primeiro processo após uma mudança no CSV precisa interpretá-lo.
+    """
+    caminho = config_interface.CAMINHO_RELATORIO
+    if not os.path.exists(caminho):
+        return pd.DataFrame()
+
+    quadros = abrir_ou_publicar(
+        os.path.join(config_interface.PASTA_COMPARTILHADA, "relatorio"),
+        ["relatorio"],
+        _versao_publicada(os.path.getmtime(caminho)),
+        lambda: {"relatorio": _ler_relatorio(caminho)},
+    )
+    # Cópia rasa: quem chama pode trocar colunas sem alterar o quadro compartilhado
+    return quadros["relatorio"].copy(deep=False)
+
+
+def montar_catalogo_promocoes(relatorio):
+    """Uma linha por período distinto de cada promoção do relatório (sem a loja), com
+    o nome exibido no selectbox.
+
+    Ex.: "TABLOIDE 29 A 10 - 29/07 A 10/08 - 2024". A ordem é a do relatório.
+    """
+    catalogo = pd.DataFrame(
+        {
+            "Nome Agrupado": relatorio["Nome Promocao"]
+            .astype(str)
+            .str.extract(r"^(TABLOIDE \d+ A \d+)", expand=False),
+            "Data Inicial": pd.to_datetime(relatorio["Data Inicial"]),
+            "Data Final": pd.to_datetime(relatorio["Data Final"]),
+        }
+    ).drop_duplicates()
+
+    # Adicionar a data inicial e final no formato dd/mm e o ano da promoção
+    mes_formatado = (
+        catalogo["Data Inicial"].dt.strftime("%d/%m")
+        + " A "
+        + catalogo["Data Final"].dt.strftime("%d/%m")
+        + " - "
+        + catalogo["Data Inicial"].dt.year.astype(str)
+    )
+    catalogo["Nome Agrupado com Mês"] = catalogo["Nome Agrupado"] + " - " + mes_formatado
+    return catalogo.reset_index(drop=True)
+
+
+@lru_cache(maxsize=1)
+def _catalogo_promocoes(modificado_em):
+    return abrir_ou_publicar(
+        os.path.join(config_interface.PASTA_COMPARTILHADA, "catalogo"),
+        ["catalogo"],
+        _versao_publicada(modificado_em),
+        lambda: {"catalogo": montar_catalogo_promocoes(carregar_dados())},
+    )["catalogo"]
+
+
+def carregar_catalogo_promocoes():
+    """Catálogo de promoções pré-calculado (snapshot no conjunto compartilhado)."""
+    caminho = config_interface.CAMINHO_RELATORIO
+    if not os.path.exists(caminho):
+        return pd.DataFrame(
+            columns=["Nome Agrupado", "Data Inicial", "Data Final", "Nome Agrupado com Mês"]
+        )
+    # Cópia rasa: quem chama pode trocar colunas sem alterar o snapshot
+    return _catalogo_promocoes(os.path.getmtime(caminho)).copy(deep=False)
+
+
+@lru_cache(maxsize=1)
+def _skus_relatorio(modificado_em):
+    return frozenset(carregar_dados()["SKU"].astype(str))
+
+
+@lru_cache(maxsize=12)
+def _carregar_mes_validado(caminho_arquivo, modificado_em, mtime_relatorio):
+    """Carrega e valida um arquivo mensal; o resultado fica em memória até o arquivo mudar.
+
+    O resultado validado é publicado no conjunto compartilhado: os demais processos
+    apenas mapeiam os arquivos, sem ler o CSV nem validar de novo.
+    """
+    nome_arquivo = os.path.basename(caminho_arquivo)
+
+    def validar():
+        resultado = validar_cupons(
+            carregar_arquivo_csv(caminho_arquivo), _skus_relatorio(mtime_relatorio), nome_arquivo
+        )
+        resultado["dados"] = _preparar_cupons(resultado["dados"])
+        resultado["contagem"] = pd.DataFrame([resultado["contagem"]])
+        return resultado
+
+    quadros = abrir_ou_publicar(
+        os.path.join(config_interface.PASTA_COMPARTILHADA, os.path.splitext(nome_arquivo)[0]),
+        ["dados", "anomalias", "contagem"],
+        # A validação depende do CSV, do relatório (SKUs) e das próprias regras
+        _versao_publicada(modificado_em, mtime_relatorio),
+        validar,
+    )
+    return {
+        "dados": quadros["dados"],
+        "anomalias": quadros["anomalias"],
+        "contagem": quadros["contagem"].iloc[0].to_dict(),
+    }
+
+
+def _preparar_cupons(dados):
+    """Cupons de um mês no formato usado pelas páginas, calculado uma vez na carga.
+
+    SKU e cupom viram texto e a coluna de destaque (🔴 ou 🟢) vem primeiro. As linhas
+    ficam ordenadas por `Data Cupom` (e loja no mesmo dia): o período de uma promoção
+    é uma fatia contínua do quadro publicado.
+    """
+    if dados.empty:
+        return dados
+    dados = dados.assign(
+        SKU=dados["SKU"].astype(str), **{"Num.Cupom": dados["Num.Cupom"].astype(str)}
+    )
+    dados.insert(0, "Destaque", np.where(dados["Desconto Unitario"] > 5, "🔴", "🟢"))
+    return dados.sort_values(["Data Cupom", "Loja"], kind="stable", ignore_index=True)
+
+
+def _arquivos_mensais(data_inicial, data_final):
+    """Caminhos dos arquivos mensais existentes para o período (desde o mês de início)."""
+    inicio_mes = pd.Timestamp(data_inicial).replace(day=1)
+    meses = pd.date_range(start=inicio_mes, end=data_final, freq="MS").strftime("%m")
+    caminhos = [
+        os.path.join(config_interface.PASTA_TRATADO, f"dado_final-{mes}.csv") for mes in meses
+    ]
+    return [caminho for caminho in caminhos if os.path.exists(caminho)]
+
+
+def versao_promocao(data_inicial, data_final):
+    """Datas de modificação do relatório e dos arquivos mensais de que a análise do
+    período depende; muda sempre que algum deles é atualizado."""
+    caminhos = [config_interface.CAMINHO_RELATORIO] + _arquivos_mensais(data_inicial, data_final)
+    return tuple(os.path.getmtime(caminho) for caminho in caminhos if os.path.exists(caminho))
+
+
+def _versao_mes(caminho_arquivo):
+    """Argumentos de `_carregar_mes_validado`: o arquivo e as versões de que depende."""
+    return (
+        caminho_arquivo,
+        os.path.getmtime(caminho_arquivo),
+        os.path.getmtime(config_interface.CAMINHO_RELATORIO),
+    )
+
+
+def validar_meses(data_inicial, data_final):
+    """Resultados da validação (dados, anomalias e contagem) de cada arquivo mensal
+    do período."""
+    return [
+        _carregar_mes_validado(*_versao_mes(caminho_arquivo))
+        for caminho_arquivo in _arquivos_mensais(data_inicial, data_final)
+    ]
+
+
+def meses_em_memoria():
+    """Quantos arquivos mensais validados estão no cache deste processo."""
+    return _carregar_mes_validado.cache_info().currsize
+
+
+def publicar_conjunto_compartilhado():
+    """Publica o relatório, o catálogo e todos os arquivos mensais (ex.: antes de
+    subir os processos)."""
+    carregar_dados()
+    carregar_catalogo_promocoes()
+    for arquivo in sorted(os.listdir(config_interface.PASTA_TRATADO)):
+        if arquivo.startswith("dado_final-") and arquivo.endswith(".csv"):
+            caminho_arquivo = os.path.join(config_interface.PASTA_TRATADO, arquivo)
+            _carregar_mes_validado(*_versao_mes(caminho_arquivo))
+
+
+def quadros_publicados():
+    """Indica, para o relatório, o catálogo e cada arquivo mensal, se o conjunto
+    compartilhado já tem a versão atual (sem abrir nem carregar nada)."""
+    pasta = config_interface.PASTA_COMPARTILHADA
+    caminho_relatorio = config_interface.CAMINHO_RELATORIO
+    if not os.path.exists(caminho_relatorio):
+        return {"relatorio": False, "catalogo": False}
+
+    mtime_relatorio = os.path.getmtime(caminho_relatorio)
+    versao_relatorio = _versao_publicada(mtime_relatorio)
+    publicados = {
+        nome: quadro_publicado(os.path.join(pasta, nome, nome), versao_relatorio)
+        for nome in ["relatorio", "catalogo"]
+    }
+    arquivos = (
+        sorted(os.listdir(config_interface.PASTA_TRATADO))
+        if os.path.isdir(config_interface.PASTA_TRATADO)
+        else []
+    )
+    for arquivo in arquivos:
+        if arquivo.startswith("dado_final-") and arquivo.endswith(".csv"):
+            nome = os.path.splitext(arquivo)[0]
+            versao = _versao_publicada(
+                os.path.getmtime(os.path.join(config_interface.PASTA_TRATADO, arquivo)),
+                mtime_relatorio,
+            )
+            publicados[nome] = all(
+                quadro_publicado(os.path.join(pasta, nome, quadro), versao)
+                for quadro in ["dados", "anomalias", "contagem"]
+            )
+    return publicados
+
+
+def carregar_dados_mensais(data_inicial, data_final):
+    """Carrega dinamicamente os arquivos mensais conforme o período selecionado."""
+    arquivos_mensais = [resultado["dados"] for resultado in validar_meses(data_inicial, data_final)]
+    return pd.concat(arquivos_mensais, ignore_index=True) if arquivos_mensais else pd.DataFrame()
+
+
+def carregar_qualidade(data_inicial, data_final):
+    """Contagem de anomalias por arquivo e anomalias do período, já calculadas na carga."""
+    inicio_mes = pd.Timestamp(data_inicial).replace(day=1)
+    resultados = validar_meses(inicio_mes, data_final)
+    if not resultados:
+        return {"contagem": pd.DataFrame(), "anomalias": pd.DataFrame()}
+
+    anomalias = pd.concat([resultado["anomalias"] for resultado in resultados], ignore_index=True)
+    datas = pd.to_datetime(anomalias["Data Cupom"])  # vazia, a coluna não tem tipo data
+    return {
+        "contagem": pd.DataFrame([resultado["contagem"] for resultado in resultados]),
+        "anomalias": anomalias[datas.between(data_inicial, data_final)],
+    }
+
+
+def carregar_cupons_promocao(data_inicial_promocao, data_final_promocao):
+    """Carrega os cupons de uma promoção, já normalizados e com a coluna de destaque.
+
+    Traz sempre todas as lojas: as páginas por loja trabalham sobre os agregados
+    de `analisar_promocao`, que somam as lojas selecionadas sem voltar aos cupons.
+
+    Cada mês é publicado em ordem de `Data Cupom`, então o período da promoção é
+    uma fatia contínua de cada arquivo. Uma promoção dentro de um mês devolve só
+    visões somente leitura dos arquivos mapeados, sem cópia; uma que cruza meses
+    junta as fatias de cada mês.
+    """
+    inicio = pd.Timestamp(data_inicial_promocao)
+    fim = pd.Timestamp(data_final_promocao)
+
+    fatias = []
+    # Os arquivos são mensais: começa pelo primeiro dia do mês da promoção
+    for resultado in validar_meses(inicio.replace(day=1), fim):
+        dados = resultado["dados"]
+        if dados.empty:
+            continue
+        datas = dados["Data Cupom"].to_numpy()
+        primeira = np.searchsorted(datas, inicio.to_datetime64(), side="left")
+        ultima = np.searchsorted(datas, fim.to_datetime64(), side="right")
+        if ultima > primeira:
+            fatias.append(dados.iloc[primeira:ultima])
+
+    if not fatias:
+        return pd.DataFrame()
+    return fatias[0] if len(fatias) == 1 else pd.concat(fatias, ignore_index=True)
+
+
+def calcular_custos_encarte(dados_filtrados):
+
+    # Filtra todas as promoções relacionadas ao mesmo período
+    filtrados = dados_filtrados
+
+    # Dicionário para armazenar os preços por SKU e loja
+    preco_por_sku_loja = {}
+
+    for _, linha in filtrados.iterrows():
+        sku = linha["SKU"]
+        preco_promocional = linha["Preco Venda Promocao"]
+        loja = linha["Loja"]
+
+        if sku not in preco_por_sku_loja:
+            preco_por_sku_loja[sku] = {}
+
+        preco_por_sku_loja[sku][loja] = {
+            "preco_promocional": preco_promocional,
+        }
+
+    # Verifica se todos os SKUs têm preços promocionais iguais entre as lojas
+    modelo_unico = True
+    for sku, lojas in preco_por_sku_loja.items():
+        preco_promocional_comum = list(lojas.values())[0]["preco_promocional"]
+
+        for loja, precos in lojas.items():
+            if precos["preco_promocional"] != preco_promocional_comum:
+                modelo_unico = False
+                break
+
+        if not modelo_unico:
+            break
+
+    # Define o custo com base no modelo identificado
+    custo = 3600 if modelo_unico else 6400
+    return custo
+
+
+def gerar_insights(dados_filtrados, custo_encarte):
+    # Quantidade de cupons ativados
+    quant_cupons_ativados = dados_filtrados["Num.Cupom"].nunique()
+
+    # Quantidade de itens unicos ativados
+    quant_itens_unicos_ativados = dados_filtrados["Familia"].nunique()
+
+    # Quantidade de itens vendidos
+    quant_itens_vendidos = dados_filtrados["Quantidade Comprada"].sum()
+
+    # Calcular desconto total
+    desconto_total = dados_filtrados["Desconto Total"].sum()
+
+    # Calcular a receita bruta
+    receita_bruta = dados_filtrados["Quantidade Comprada"] * dados_filtrados["Preco Venda Promocao"]
+    receita_bruta_total = receita_bruta.sum()
+
+    # Calcular Lucro Bruto (dado nao totalmente correto)
+    lucro_bruto = (
+        dados_filtrados["Preco Venda Promocao"] - dados_filtrados["Custo Produto"]
+    ) * dados_filtrados["Quantidade Comprada"]
+    lucro_bruto_total = lucro_bruto.sum()
+
+    # Lucro Liquido
+    lucro_liquido = lucro_bruto_total - custo_encarte - desconto_total
+
+    # Custo total
+    custo_total = desconto_total + custo_encarte
+
+    return (
+        quant_cupons_ativados,
+        quant_itens_unicos_ativados,
+        quant_itens_vendidos,
+        desconto_total,
+        receita_bruta_total,
+        lucro_bruto_total,
+        lucro_liquido,
+        custo_total,
+    )
+
+
+def analisar_promocao(data_inicial_promocao, data_final_promocao):
+    """Carrega os cupons da promoção e calcula custo do tabloide, insights, agregados
+    por loja e qualidade."""
+    dados_filtrados = carregar_cupons_promocao(data_inicial_promocao, data_final_promocao)
+    qualidade = carregar_qualidade(data_inicial_promocao, data_final_promocao)
+    if dados_filtrados.empty:
+        return {
+            "cupons": dados_filtrados,
+            "custo_encarte": None,
+            "insights": None,
+            "agregados": None,
+            "qualidade": qualidade,
+        }
+
+    custo_encarte = calcular_custos_encarte(dados_filtrados)
+    return {
+        "cupons": dados_filtrados,
+        "custo_encarte": custo_encarte,
+        "insights": gerar_insights(dados_filtrados, custo_encarte),
+        "agregados": agregar_lojas(dados_filtrados),
+        "qualidade": qualidade,
+    }
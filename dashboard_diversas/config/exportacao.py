@@ -0,0 +1,132 @@
+import hashlib
+import io
+import os
+import tempfile
+import zipfile
+
+import pandas as pd
+
+import config.config_interface as config_interface
+from config.relatorios import (
+    montar_indicadores,
+    resumir_familias,
+    resumir_itens_por_loja,
+    resumir_lojas,
+)
+from config.utils import (
+    FORMATOS_CUPONS,
+    formatar_colunas,
+    formatar_float_serie,
+    formatar_inteiro_serie,
+    formatar_moeda_serie,
+)
+from config.validacao import VERSAO_REGRAS
+
+# Linhas escritas por vez em cada CSV do pacote
+LINHAS_POR_BLOCO = 5000
+
+# Versão do conteúdo do pacote: aumentar ao mudar tabelas, colunas ou formatos,
+# para que os ZIPs já gravados sejam gerados de novo
+VERSAO_EXPORTACAO = 1
+
+
+def _escrever_csv(pacote, nome_arquivo, df, formatos=None):
+    """Escreve o DataFrame no ZIP em blocos, no mesmo formato dos CSVs de entrada.
+
+    As colunas de `formatos` saem com os mesmos textos da tabela do app; cada
+    bloco é formatado só quando é escrito.
+    """
+    with pacote.open(nome_arquivo, "w") as arquivo_binario:
+        # utf-8-sig para o Excel reconhecer os acentos ao abrir o CSV
+        with io.TextIOWrapper(arquivo_binario, encoding="utf-8-sig", newline="") as arquivo:
+            for inicio in range(0, max(len(df), 1), LINHAS_POR_BLOCO):
+                bloco = df.iloc[inicio : inicio + LINHAS_POR_BLOCO]
+                if formatos:
+                    bloco = formatar_colunas(bloco, formatos)
+                bloco.round(2).to_csv(
+                    arquivo, sep=";", decimal=",", index=False, header=inicio == 0
+                )
+
+
+def exportar_promocao(analise_promocao, destino):
+    """Grava em `destino` (arquivo binário) um ZIP com a análise completa da promoção.
+
+    `analise_promocao` é o resultado de `config.dados.analisar_promocao`, normalmente
+    já em cache; nada é recarregado dos arquivos mensais.
+    """
+    cupons = analise_promocao["cupons"]
+    agregados = analise_promocao["agregados"]
+    indicadores = montar_indicadores(
+        analise_promocao["insights"], analise_promocao["custo_encarte"]
+    )
+    # Contagens, quantidade vendida e, a partir do desconto, valores em reais
+    valores = indicadores["Valor"]
+    indicadores["Valor Formatado"] = pd.concat(
+        [
+            formatar_inteiro_serie(valores.iloc[:2]),
+            formatar_float_serie(valores.iloc[2:3]),
+            formatar_moeda_serie(valores.iloc[3:]),
+        ]
+    )
+    # A coluna mistura contagens e valores: sai como texto, sem ",0" nas contagens
+    indicadores["Valor"] = pd.concat(
+        [
+            valores.iloc[:2].round().astype(int).astype(str),
+            valores.iloc[2:].map("{:.2f}".format).str.replace(".", ",", regex=False),
+        ]
+    )
+
+    tabelas = {
+        "indicadores.csv": lambda: indicadores,
+        "cupons.csv": lambda: cupons,
+        "resumo_lojas.csv": lambda: resumir_lojas(cupons),
+        "itens_por_loja.csv": lambda: resumir_itens_por_loja(agregados),
+        "familias.csv": lambda: resumir_familias(agregados),
+    }
+
+    # Cupons no mesmo formato da tabela da página de insights
+    formatos = {"cupons.csv": FORMATOS_CUPONS}
+
+    with zipfile.ZipFile(destino, "w", compression=zipfile.ZIP_DEFLATED) as pacote:
+        # Uma tabela por vez: cada resumo é liberado antes de gerar o próximo
+        for nome_arquivo, gerar_tabela in tabelas.items():
+            _escrever_csv(pacote, nome_arquivo, gerar_tabela(), formatos.get(nome_arquivo))
+
+
+def gerar_arquivo_exportacao(chave, versao, obter_analise, pasta=None):
+    """Caminho do ZIP da promoção em disco, gerado só se ainda não existir.
+
+    `chave` é (data_inicial, data_final) e `versao` identifica os arquivos de
+    origem (ex.: `config.dados.versao_promocao`): um CSV atualizado gera um novo
+    ZIP, assim como uma mudança nas regras de carga (`VERSAO_REGRAS`) ou no
+    conteúdo do pacote (`VERSAO_EXPORTACAO`). O pacote é escrito direto no
+    arquivo, sem passar inteiro pela memória, e fica disponível para todas as
+    sessões e processos. `obter_analise()` só é chamado quando o ZIP precisa ser
+    gerado.
+    """
+    pasta = pasta or config_interface.PASTA_EXPORTACOES
+    prefixo = f"{chave[0]:%Y%m%d}-{chave[1]:%Y%m%d}-"
+    versao_completa = (*versao, VERSAO_REGRAS, VERSAO_EXPORTACAO)
+    resumo_versao = hashlib.sha1(repr(versao_completa).encode()).hexdigest()[:12]
+    caminho = os.path.join(pasta, f"{prefixo}{resumo_versao}.zip")
+    if os.path.exists(caminho):
+        return caminho
+
+    os.makedirs(pasta, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=pasta, suffix=".parcial", delete=False) as arquivo:
+        try:
+            exportar_promocao(obter_analise(), arquivo)
+        except BaseException:
+            os.remove(arquivo.name)
+            raise
+    # Troca atômica: quem baixa nunca vê um ZIP pela metade
+    os.replace(arquivo.name, caminho)
+
+    # Remove os ZIPs de versões anteriores desta promoção
+    for nome in os.listdir(pasta):
+        if nome.startswith(prefixo) and nome.endswith(".zip") and nome != os.path.basename(caminho):
+            try:
+                os.remove(os.path.join(pasta, nome))
+            except OSError:
+                pass
+    return caminho
@@ -0,0 +1,94 @@
+"""Perfil de inicialização e estado de aquecimento do app.
+
+Este módulo é importado antes de pandas na página de entrada, então só usa a
+biblioteca padrão no topo; o resto é importado dentro das funções.
+
+Aquecer o conjunto compartilhado e conferir o estado (ex.: antes de liberar o
+contêiner para receber tráfego), a partir da pasta do app:
+
+    python -m config.inicializacao --aquecer
+
+Sai com código 1 enquanto algum quadro não estiver publicado e atual.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+
+
+def _idade_do_processo():
+    """Segundos desde o início do processo, lidos do /proc do Linux (None sem ele)."""
+    try:
+        with open("/proc/self/stat") as arquivo:
+            # O nome do executável pode ter espaços: os campos contam a partir do ")"
+            campos = arquivo.read().rsplit(")", 1)[1].split()
+        with open("/proc/uptime") as arquivo:
+            segundos_ligado = float(arquivo.read().split()[0])
+        # starttime (campo 22) é contado em ticks desde o boot
+        return max(segundos_ligado - int(campos[19]) / os.sysconf("SC_CLK_TCK"), 0.0)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+_idade_na_importacao = _idade_do_processo()
+# Onde o sistema não informa o início do processo, os marcos contam da importação
+ORIGEM_MARCOS = "início do processo" if _idade_na_importacao is not None else "importação do app"
+_inicio = time.perf_counter() - (_idade_na_importacao or 0.0)
+_marcos = {}
+_trava = threading.Lock()
+
+
+def registrar_marco(nome):
+    """Guarda os segundos desde `ORIGEM_MARCOS` (o início do processo, no Linux) até `nome`.
+
+    Só a primeira ocorrência de cada marco é guardada: o perfil é o da partida a
+    frio, não o das reexecuções do script.
+    """
+    with _trava:
+        _marcos.setdefault(nome, round(time.perf_counter() - _inicio, 3))
+
+
+def marcos():
+    with _trava:
+        return dict(_marcos)
+
+
+def aquecer():
+    """Publica o relatório, o catálogo e os arquivos mensais no conjunto compartilhado."""
+    from config.dados import publicar_conjunto_compartilhado
+
+    publicar_conjunto_compartilhado()
+    registrar_marco("aquecimento")
+
+
+def estado_aquecimento():
+    """Situação do conjunto compartilhado e dos caches deste processo.
+
+    `aquecido` é verdadeiro quando o relatório, o catálogo e todos os arquivos
+    mensais estão publicados para as versões atuais dos CSVs: um processo novo
+    então só mapeia os arquivos, sem ler nem validar nada.
+    """
+    from config.dados import meses_em_memoria, quadros_publicados
+    from config.prefetch import obter_prefetcher, prefetcher_iniciado
+
+    publicados = quadros_publicados()
+    prefetcher = obter_prefetcher() if prefetcher_iniciado() else None
+    return {
+        "aquecido": all(publicados.values()),
+        "publicados": publicados,
+        "meses_em_memoria": meses_em_memoria(),
+        "promocoes_em_cache": len(prefetcher.cache) if prefetcher else 0,
+        "bytes_em_cache": prefetcher.cache.total_bytes if prefetcher else 0,
+        "marcos": marcos(),
+        "origem_marcos": ORIGEM_MARCOS,
+    }
+
+
+if __name__ == "__main__":
+    if "--aquecer" in sys.argv[1:]:
+        aquecer()
+    estado = estado_aquecimento()
+    print(json.dumps(estado, ensure_ascii=False, indent=2))
+    sys.exit(0 if estado["aquecido"] else 1)
@@ -0,0 +1,27 @@
+# Dicionário de mapeamento das lojas
+MAPEAMENTO_LOJAS = {
+    "1": "Espera Feliz 1",
+    "2": "Caiana",
+    "3": "Divino 1",
+    "5": "Alto Jequitibá",
+    "6": "Divino 2",
+    "8": "Espera Feliz 2",
+}
+
+# Dicionário inverso para buscar os códigos das lojas a partir dos nomes
+MAPEAMENTO_INVERSO_LOJAS = {v: k for k, v in MAPEAMENTO_LOJAS.items()}
+
+
+def normalizar_codigo_loja(loja):
+    """Código da loja como texto sem zeros à esquerda ("01", 1 e "1" viram "1")."""
+    return str(int(loja))
+
+
+def nomes_lojas(codigos):
+    """Nomes das lojas conhecidas, na ordem dos códigos informados."""
+    return [MAPEAMENTO_LOJAS[codigo] for codigo in codigos if codigo in MAPEAMENTO_LOJAS]
+
+
+def codigos_lojas(nomes):
+    """Conjunto de códigos das lojas a partir dos nomes selecionados."""
+    return {MAPEAMENTO_INVERSO_LOJAS[nome] for nome in nomes}
@@ -0,0 +1,197 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+
+import config.config_interface as config_interface
+from config.compartilhado import coluna_mapeada
+from config.dados import analisar_promocao, versao_promocao
+
+
+def _tamanho_resultado(resultado):
+    """Estimativa em bytes do resultado de uma promoção (dominado pelos cupons).
+
+    As colunas que são visões do conjunto compartilhado não contam: essa memória é
+    dos arquivos mapeados, uma só vez para todos os processos.
+    """
+    cupons = resultado["cupons"]
+    return int(
+        sum(
+            cupons[coluna].memory_usage(deep=True, index=False)
+            for coluna in cupons.columns
+            if not coluna_mapeada(cupons[coluna])
+        )
+    )
+
+
+class CachePromocoes:
+    """Cache LRU, seguro entre threads, limitado pela memória ocupada."""
+
+    def __init__(self, limite_bytes):
+        self.limite_bytes = limite_bytes
+        self._itens = OrderedDict()
+        self._tamanhos = {}
+        self._total_bytes = 0
+        self._trava = threading.Lock()
+
+    def obter(self, chave):
+        with self._trava:
+            if chave not in self._itens:
+                return None
+            self._itens.move_to_end(chave)
+            return self._itens[chave]
+
+    def guardar(self, chave, resultado):
+        tamanho = _tamanho_resultado(resultado)
+        # Um item maior que o limite não é guardado
+        if tamanho > self.limite_bytes:
+            return
+
+        with self._trava:
+            if chave in self._itens:
+                self._total_bytes -= self._tamanhos.pop(chave)
+                del self._itens[chave]
+
+            self._itens[chave] = resultado
+            self._tamanhos[chave] = tamanho
+            self._total_bytes += tamanho
+
+            # Remove os itens menos usados até respeitar o limite
+            while self._total_bytes > self.limite_bytes:
+                chave_antiga, _ = self._itens.popitem(last=False)
+                self._total_bytes -= self._tamanhos.pop(chave_antiga)
+
+    def __contains__(self, chave):
+        with self._trava:
+            return chave in self._itens
+
+    def __len__(self):
+        with self._trava:
+            return len(self._itens)
+
+    @property
+    def total_bytes(self):
+        return self._total_bytes
+
+
+class PrefetcherPromocoes:
+    """Pré-carrega, em segundo plano, as promoções vizinhas à que está na tela.
+
+    As chaves são tuplas (data_inicial, data_final) da promoção. No cache elas
+    levam também a versão dos arquivos de origem (`versao_promocao`), então um
+    CSV atualizado nunca é servido a partir de uma análise antiga. Cada sessão
+    cancela apenas os próprios pré-carregamentos ao mudar de seleção.
+    """
+
+    def __init__(self, limite_bytes=None, max_threads=None):
+        if limite_bytes is None:
+            limite_bytes = config_interface.LIMITE_CACHE_PROMOCOES_MB * 1024 * 1024
+        if max_threads is None:
+            max_threads = config_interface.THREADS_PREFETCH
+
+        self.cache = CachePromocoes(limite_bytes)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_threads, thread_name_prefix="prefetch-promocoes"
+        )
+        self._em_andamento = {}
+        # Sessões que ainda querem cada pré-carregamento em curso
+        self._interessados = {}
+        # Reentrante: o callback de conclusão pode rodar dentro de `agendar_vizinhas`
+        self._trava = threading.RLock()
+
+    @staticmethod
+    def _chave_cache(chave):
+        return chave + (versao_promocao(*chave),)
+
+    def _executar(self, chave_cache):
+        # Todas as sessões interessadas já mudaram de seleção
+        with self._trava:
+            if not self._interessados.get(chave_cache):
+                return None
+
+        resultado = analisar_promocao(*chave_cache[:2])
+        self.cache.guardar(chave_cache, resultado)
+        return resultado
+
+    def _remover_em_andamento(self, chave_cache, futuro):
+        with self._trava:
+            if self._em_andamento.get(chave_cache) is futuro:
+                del self._em_andamento[chave_cache]
+                self._interessados.pop(chave_cache, None)
+
+    def obter(self, chave):
+        """Retorna a análise da promoção, do cache, de um pré-carregamento em curso
+        ou calculando na hora."""
+        chave_cache = self._chave_cache(chave)
+        resultado = self.cache.obter(chave_cache)
+        if resultado is not None:
+            return resultado
+
+        with self._trava:
+            futuro = self._em_andamento.get(chave_cache)
+
+        if futuro is not None:
+            try:
+                resultado = futuro.result()
+            except CancelledError:
+                resultado = None
+            if resultado is not None:
+                return resultado
+
+        resultado = analisar_promocao(*chave)
+        self.cache.guardar(chave_cache, resultado)
+        return resultado
+
+    def cancelar(self, sessao=None):
+        """Desiste dos pré-carregamentos da `sessao` que ainda não começaram.
+
+        Um pré-carregamento só é cancelado quando nenhuma outra sessão o quer; os que
+        já estão rodando terminam e continuam disponíveis para `obter`.
+        """
+        with self._trava:
+            for chave_cache, interessados in list(self._interessados.items()):
+                interessados.discard(sessao)
+                if interessados:
+                    continue
+                futuro = self._em_andamento.get(chave_cache)
+                if futuro is not None and futuro.cancel():
+                    self._em_andamento.pop(chave_cache, None)
+                    self._interessados.pop(chave_cache, None)
+
+    def agendar_vizinhas(self, chaves, indice_atual, sessao=None):
+        """Agenda, para a `sessao`, a promoção anterior e a próxima à selecionada."""
+        self.cancelar(sessao)
+
+        vizinhas = [chaves[i] for i in (indice_atual + 1, indice_atual - 1) if 0 <= i < len(chaves)]
+        with self._trava:
+            for chave in vizinhas:
+                chave_cache = self._chave_cache(chave)
+                if chave_cache in self.cache:
+                    continue
+                if chave_cache in self._em_andamento:
+                    self._interessados[chave_cache].add(sessao)
+                    continue
+                self._interessados[chave_cache] = {sessao}
+                futuro = self._executor.submit(self._executar, chave_cache)
+                self._em_andamento[chave_cache] = futuro
+                futuro.add_done_callback(
+                    lambda f, chave_cache=chave_cache: self._remover_em_andamento(chave_cache, f)
+                )
+
+
+_prefetcher = None
+_trava_prefetcher = threading.Lock()
+
+
+def obter_prefetcher():
+    """Pré-carregador único do processo, compartilhado entre as sessões do Streamlit
+    (vive fora das reexecuções do script)."""
+    global _prefetcher
+    with _trava_prefetcher:
+        if _prefetcher is None:
+            _prefetcher = PrefetcherPromocoes()
+        return _prefetcher
+
+
+def prefetcher_iniciado():
+    """Indica se o pré-carregador já foi criado, sem criá-lo."""
+    return _prefetcher is not None
@@ -0,0 +1,252 @@
+import numpy as np
+import pandas as pd
+
+from config.lojas import normalizar_codigo_loja
+
+# Meta de lucro líquido: custo total da promoção acrescido de 20%
+FATOR_META_LUCRO = 1.2
+
+
+def contar_dias_ativos(data_inicio, data_fim):
+    """Conta os dias do período, excluindo domingos (exceto vésperas de Natal e Ano Novo)."""
+    if pd.isna(data_inicio) or pd.isna(data_fim):
+        return 0
+    dias = pd.date_range(start=data_inicio, end=data_fim)
+    vespera = (dias.month == 12) & np.isin(dias.day, [24, 31])
+    return int(((dias.weekday != 6) | vespera).sum())
+
+
+def classificar_abc(percentual):
+    """Classificação ABC vetorizada pelo percentual acumulado de faturamento."""
+    return np.select([percentual <= 80, percentual <= 95], ["A", "B"], default="C")
+
+
+def agregar_lojas(df):
+    """Agregados da promoção por loja, usados pelas páginas e pela exportação.
+
+    - `diario`: uma linha por loja, família e dia com venda (quantidade, receita,
+      soma dos preços promocionais e linhas que atingiram a ativação);
+    - `ativacoes`: cupons distintos que ativaram a promoção, por loja e família.
+
+    As duas tabelas são aditivas entre lojas, então resultados de várias lojas
+    saem da soma dos agregados, sem voltar às linhas de cupom.
+    """
+    df = df.assign(
+        Loja=df["Loja"].map(normalizar_codigo_loja),
+        receita=df["Quantidade Comprada"] * df["Preco Venda Promocao"],
+        ativado=df["Quantidade Comprada"] >= df["Ativacao Necessaria"],
+    )
+    diario = (
+        df.groupby(["Loja", "Familia", "Data Cupom"], observed=True)
+        .agg(
+            Quantidade_Vendida=("Quantidade Comprada", "sum"),
+            Receita=("receita", "sum"),
+            Faturamento=("Preco Venda Promocao", "sum"),
+            Vezes_Ativado=("ativado", "sum"),
+        )
+        .reset_index()
+    )
+    ativacoes = (
+        df[df["ativado"]]
+        .groupby(["Loja", "Familia"], observed=True)["Num.Cupom"]
+        .nunique()
+        .reindex(pd.MultiIndex.from_frame(diario[["Loja", "Familia"]].drop_duplicates()))
+        .fillna(0)
+        .astype(int)
+        .rename("Ativacoes")
+        .reset_index()
+    )
+    return {"diario": diario, "ativacoes": ativacoes}
+
+
+def lojas_agregadas(agregados):
+    """Códigos das lojas presentes nos agregados, em ordem."""
+    return list(agregados["diario"]["Loja"].unique())
+
+
+def _filtrar_lojas(tabela, lojas):
+    return tabela if lojas is None else tabela[tabela["Loja"].isin(lojas)]
+
+
+def calcular_curva_abc(agregados):
+    """Curva ABC das famílias pelo faturamento (quantidade x preço promocional) de
+    todas as lojas."""
+    df_faturamento = (
+        agregados["diario"]
+        .groupby("Familia", observed=True)
+        .agg(
+            quantidade_vendida=("Quantidade_Vendida", "sum"),
+            faturamento_total=("Receita", "sum"),
+        )
+        .reset_index()
+        .sort_values(by="faturamento_total", ascending=False)
+    )
+    df_faturamento["percentual_acumulado"] = (
+        df_faturamento["faturamento_total"].cumsum()
+        / df_faturamento["faturamento_total"].sum()
+        * 100
+    )
+    df_faturamento["curva_abc"] = classificar_abc(df_faturamento["percentual_acumulado"])
+    return df_faturamento
+
+
+def resumir_lojas(df):
+    """Totais da promoção por loja."""
+    df = df.assign(
+        receita_bruta=df["Quantidade Comprada"] * df["Preco Venda Promocao"],
+        lucro_bruto=(df["Preco Venda Promocao"] - df["Custo Produto"]) * df["Quantidade Comprada"],
+    )
+    return (
+        df.groupby("Loja", observed=True)
+        .agg(
+            Cupons_Ativados=("Num.Cupom", "nunique"),
+            Itens_Ativados=("Familia", "nunique"),
+            Quantidade_Vendida=("Quantidade Comprada", "sum"),
+            Desconto_Total=("Desconto Total", "sum"),
+            Receita_Bruta=("receita_bruta", "sum"),
+            Lucro_Bruto=("lucro_bruto", "sum"),
+        )
+        .reset_index()
+    )
+
+
+def resumir_itens(agregados, lojas=None):
+    """Métricas por família das lojas selecionadas (páginas de estatísticas por loja).
+
+    Com várias lojas, as vendas de cada dia são somadas antes de contar os dias
+    ativados; o percentual usa o período do primeiro ao último cupom das lojas.
+    """
+    diario = (
+        _filtrar_lojas(agregados["diario"], lojas)
+        .groupby(["Familia", "Data Cupom"], observed=True)[
+            ["Quantidade_Vendida", "Faturamento", "Vezes_Ativado"]
+        ]
+        .sum()
+        .reset_index()
+    )
+    df_resumo = (
+        diario.groupby("Familia", observed=True)
+        .agg(
+            Quantidade_Vendida=("Quantidade_Vendida", "sum"),
+            Dias_Ativado=("Data Cupom", "size"),
+            Vezes_Ativado=("Vezes_Ativado", "sum"),
+            Faturamento=("Faturamento", "sum"),
+        )
+        .reset_index()
+    )
+
+    total_dias_ativos = contar_dias_ativos(diario["Data Cupom"].min(), diario["Data Cupom"].max())
+    df_resumo["Dias_Ativado %"] = (df_resumo["Dias_Ativado"] / total_dias_ativos * 100).round(2)
+    return df_resumo
+
+
+def resumir_itens_por_loja(agregados):
+    """`resumir_itens` de cada loja separadamente, em uma única tabela."""
+    return pd.concat(
+        [resumir_itens(agregados, {loja}).assign(Loja=loja) for loja in lojas_agregadas(agregados)],
+        ignore_index=True,
+    ).pipe(lambda df: df[["Loja"] + [col for col in df.columns if col != "Loja"]])
+
+
+def resumir_familias(agregados, lojas=None, por_loja=True):
+    """Métricas diárias e curva ABC por família (página de estatísticas por produto).
+
+    Com `por_loja=False` as lojas selecionadas são somadas dia a dia e o resultado
+    tem uma linha por família. O percentual de dias ativados e a curva ABC usam
+    sempre a promoção inteira, como na página.
+    """
+    diario = agregados["diario"]
+    total_dias_ativos = contar_dias_ativos(diario["Data Cupom"].min(), diario["Data Cupom"].max())
+
+    diario = _filtrar_lojas(diario, lojas)
+    ativacoes = _filtrar_lojas(agregados["ativacoes"], lojas)
+    chaves = ["Loja", "Familia"] if por_loja else ["Familia"]
+
+    vendas_por_dia = (
+        diario.groupby(chaves + ["Data Cupom"], observed=True)["Quantidade_Vendida"]
+        .sum()
+        .reset_index()
+    )
+    ativacoes = ativacoes.groupby(chaves, observed=True)["Ativacoes"].sum()
+    grupos = vendas_por_dia.groupby(chaves, observed=True)["Quantidade_Vendida"]
+
+    maior_venda = vendas_por_dia.loc[grupos.idxmax()].set_index(chaves)
+    primeiro_dia = grupos.first()
+    ultimo_dia = grupos.last()
+    dias_com_venda = grupos.size()
+
+    variacao_primeiro_ultimo = pd.Series(
+        np.where(
+            (dias_com_venda > 1) & (primeiro_dia > 0),
+            (ultimo_dia - primeiro_dia) / primeiro_dia * 100,
+            0.0,
+        ),
+        index=primeiro_dia.index,
+    )
+
+    df_familias = pd.DataFrame(
+        {
+            "Quantidade_Vendida": grupos.sum(),
+            "Ativacoes": ativacoes.reindex(primeiro_dia.index, fill_value=0),
+            "Dia_Maior_Venda": maior_venda["Data Cupom"],
+            "Quantidade_Dia_Maior_Venda": maior_venda["Quantidade_Vendida"],
+            "Media_Venda_Dia": grupos.mean(),
+            "Dias_Ativado %": (
+                dias_com_venda / total_dias_ativos * 100 if total_dias_ativos > 0 else 0
+            ),
+            "Variacao_Diaria_Media": (
+                vendas_por_dia.assign(variacao=grupos.diff().abs())
+                .groupby(chaves, observed=True)["variacao"]
+                .mean()
+            ),
+            "Variacao_Primeiro_Ultimo %": variacao_primeiro_ultimo,
+        }
+    ).reset_index()
+
+    curva_abc = calcular_curva_abc(agregados).set_index("Familia")["curva_abc"]
+    df_familias["Curva_ABC"] = df_familias["Familia"].map(curva_abc)
+    return df_familias
+
+
+def montar_indicadores(insights, custo_encarte):
+    """Indicadores principais da promoção, na ordem exibida na página de insights."""
+    (
+        quant_cupons_ativados,
+        quant_itens_unicos_ativados,
+        quant_itens_vendidos,
+        desconto_total,
+        receita_bruta_total,
+        lucro_bruto_total,
+        lucro_liquido,
+        custo_total,
+    ) = insights
+    meta_lucro = custo_total * FATOR_META_LUCRO
+
+    return pd.DataFrame(
+        {
+            "Indicador": [
+                "Nº Cupons Ativados",
+                "Nº Itens Ativados",
+                "Quant. Itens Vend.",
+                "Total Desconto",
+                "Custo Tabloide",
+                "Custo da Promoção",
+                "Receita Bruta",
+                "Lucro Bruto",
+                "Meta de Lucro Líquido",
+                "Lucro Líquido",
+            ],
+            "Valor": [
+                quant_cupons_ativados,
+                quant_itens_unicos_ativados,
+                quant_itens_vendidos,
+                desconto_total,
+                custo_encarte,
+                custo_total,
+                receita_bruta_total,
+                lucro_bruto_total,
+                meta_lucro,
+                lucro_liquido,
+            ],
+        }
+    )
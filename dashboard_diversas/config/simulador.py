@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+
+from config.relatorios import FATOR_META_LUCRO
+
+# Elasticidade-preço da demanda: variação % da quantidade para cada 1% de variação no preço
+ELASTICIDADE_PADRAO = -2.0
+
+
+def preparar_linhas(dados_filtrados):
+    """Converte as linhas de cupom da promoção em arrays NumPy ordenados por SKU.
+
+    A ordenação por SKU permite somar as contribuições de cada produto com
+    `np.add.reduceat`, sem agrupar o DataFrame a cada cenário.
+    """
+    dados = dados_filtrados.assign(SKU=dados_filtrados["SKU"].astype(str))
+    dados = dados.sort_values("SKU", kind="stable")
+    skus, inicios = np.unique(dados["SKU"].to_numpy(), return_index=True)
+
+    return {
+        "skus": skus,
+        "inicios": inicios,
+        "quantidade": dados["Quantidade Comprada"].to_numpy(dtype=float),
+        "ativacao": dados["Ativacao Necessaria"].to_numpy(dtype=float),
+        "preco_unidade": dados["Preco Venda Unidade"].to_numpy(dtype=float),
+        "preco_promocao": dados["Preco Venda Promocao"].to_numpy(dtype=float),
+        "custo": dados["Custo Produto"].to_numpy(dtype=float),
+        "desconto": dados["Desconto Total"].to_numpy(dtype=float),
+    }
+
+
+def _pontuar(linhas, fatores_preco, ajuste_ativacao, elasticidade):
+    """Calcula, para cada cenário e linha de cupom, desconto, receita e lucro bruto.
+
+    Retorna matrizes de formato (n_cenarios, n_linhas). A quantidade de cada linha
+    responde ao preço com elasticidade constante (q * (preço / preço atual) ** e);
+    linhas que deixam de atingir a ativação saem da promoção.
+    """
+    fatores = np.asarray(fatores_preco, dtype=float).reshape(-1, 1)
+    quantidade = linhas["quantidade"]
+    preco_promocao = linhas["preco_promocao"]
+
+    # Um aumento não leva o preço promocional acima do preço de venda normal
+    # (linhas que já estão acima dele mantêm o valor observado)
+    teto = np.maximum(linhas["preco_unidade"], preco_promocao)
+    preco_cenario = np.minimum(fatores * preco_promocao, teto)
+
+    razao_preco = np.divide(
+        preco_cenario, preco_promocao, out=np.ones_like(preco_cenario), where=preco_promocao > 0
+    )
+    quantidade_cenario = quantidade * razao_preco**elasticidade
+    # Itens vendidos por unidade ativam em unidades inteiras (o cliente leva 2 ou 3,
+    # não 2,7); itens a granel (KG) comparam a quantidade fracionada como está
+    ativacao = linhas["ativacao"] + ajuste_ativacao
+    inteira = np.isclose(quantidade, np.round(quantidade))
+    ativada = np.where(
+        inteira, np.round(quantidade_cenario) >= ativacao, quantidade_cenario >= ativacao - 1e-9
+    )
+    quantidade_cenario = np.where(ativada, quantidade_cenario, 0.0)
+
+    # O desconto observado por unidade acompanha o volume; a mudança de preço entra
+    # só no lucro bruto (contá-la também no desconto a dobraria)
+    desconto = linhas["desconto"] * (quantidade_cenario / quantidade)
+    receita = preco_cenario * quantidade_cenario
+    lucro_bruto = (preco_cenario - linhas["custo"]) * quantidade_cenario
+    return desconto, receita, lucro_bruto
+
+
+def simular_cenarios(
+    linhas, fatores_preco, custo_encarte, ajuste_ativacao=0, elasticidade=ELASTICIDADE_PADRAO
+):
+    """Recalcula os indicadores da promoção para cada fator de preço promocional.
+
+    Cada fator multiplica o preço promocional de todos os SKUs (1.0 = preço atual).
+    O lucro líquido segue a mesma regra de `gerar_insights`; no fator 1.0 sem
+    ajuste de ativação os indicadores são os observados, qualquer que seja a
+    elasticidade.
+    """
+    desconto, receita, lucro_bruto = _pontuar(linhas, fatores_preco, ajuste_ativacao, elasticidade)
+
+    desconto_total = desconto.sum(axis=1)
+    lucro_bruto_total = lucro_bruto.sum(axis=1)
+    lucro_liquido = lucro_bruto_total - custo_encarte - desconto_total
+    custo_total = desconto_total + custo_encarte
+
+    return pd.DataFrame(
+        {
+            "Fator Preco": np.asarray(fatores_preco, dtype=float),
+            "Desconto Total": desconto_total,
+            "Receita Bruta": receita.sum(axis=1),
+            "Lucro Bruto": lucro_bruto_total,
+            "Custo Total": custo_total,
+            "Lucro Liquido": lucro_liquido,
+            "Meta Lucro": custo_total * FATOR_META_LUCRO,
+        }
+    )
+
+
+def varrer_precos_por_sku(
+    linhas, fatores_preco, custo_encarte, ajuste_ativacao=0, elasticidade=ELASTICIDADE_PADRAO
+):
+    """Lucro líquido da promoção ao variar o preço de um SKU por vez.
+
+    Retorna um DataFrame (fatores x SKUs): cada célula é o lucro líquido total
+    quando apenas aquele SKU recebe o fator, mantendo os demais no preço atual.
+    """
+    fatores = np.asarray(fatores_preco, dtype=float)
+    inicios = linhas["inicios"]
+
+    # Contribuição de cada linha para o lucro líquido (antes do custo do tabloide)
+    desconto, _, lucro_bruto = _pontuar(linhas, fatores, ajuste_ativacao, elasticidade)
+    contribuicao = np.add.reduceat(lucro_bruto - desconto, inicios, axis=1)
+
+    desconto_base, _, lucro_base = _pontuar(linhas, [1.0], ajuste_ativacao, elasticidade)
+    contribuicao_base = np.add.reduceat(lucro_base - desconto_base, inicios, axis=1)
+
+    total_base = contribuicao_base.sum() - custo_encarte
+    lucro_liquido = total_base - contribuicao_base + contribuicao
+
+    return pd.DataFrame(lucro_liquido, index=fatores, columns=linhas["skus"])
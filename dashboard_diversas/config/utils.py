@@ -1,4 +1,5 @@
 import pandas as pd
+import numpy as np
 import os
 
 
@@ -21,7 +22,84 @@ def formatar_float(valor):
 
 def formatar_inteiro(valor):
     """Formata um número inteiro com separadores de milhar brasileiros."""
-    return format(valor, ",d").replace(",", "X").replace(".", ",").replace("X", ".")
+    return format(valor, ",.0f").replace(",", "X").replace(".", ",").replace("X", ".")
+
+
+def _formatar_serie(serie, formatar_valor):
+    """Aplica um formatador escalar apenas aos valores distintos da série.
+
+    Os valores são fatorados; cada valor distinto é formatado uma única vez (pelo
+    próprio formatador escalar, que faz o arredondamento) e o resultado é
+    expandido pelos códigos. Valores ausentes viram "".
+    """
+    codigos, unicos = pd.factorize(pd.to_numeric(serie, errors="coerce"))
+
+    # O código -1 (ausente) aponta para o último elemento, a string vazia
+    textos = np.array([formatar_valor(valor) for valor in unicos] + [""], dtype=object)
+    return pd.Series(textos[codigos], index=serie.index, name=serie.name)
+
+
+def formatar_moeda_serie(serie, simbolo=True):
+    """Formata uma série inteira de valores monetários em reais (R$)."""
+    return _formatar_serie(serie, lambda valor: formatar_moeda(valor, simbolo))
+
+
+def formatar_float_serie(serie):
+    """Formata uma série inteira de números decimais com separadores brasileiros."""
+    return _formatar_serie(serie, formatar_float)
+
+
+def formatar_inteiro_serie(serie):
+    """Formata uma série inteira de números inteiros com separadores de milhar brasileiros."""
+    return _formatar_serie(serie, formatar_inteiro)
+
+
+def formatar_percentual_serie(serie):
+    """Formata uma série inteira de percentuais (ex.: "12,50 %")."""
+    return _formatar_serie(serie, lambda valor: f"{formatar_float(valor)} %")
+
+
+def formatar_colunas(df, formatos):
+    """Retorna uma cópia do DataFrame com as colunas de `formatos` convertidas em texto.
+
+    `formatos` mapeia o nome da coluna para um dos formatadores de série acima.
+    Colunas ausentes no DataFrame são ignoradas.
+    """
+    df_formatado = df.copy()
+    for coluna, formatador in formatos.items():
+        if coluna in df_formatado.columns:
+            df_formatado[coluna] = formatador(df_formatado[coluna])
+    return df_formatado
+
+
+def formatadores_exibicao(df, formatos):
+    """Formatadores para `Styler.format`, com os textos já calculados.
+
+    Cada coluna de `formatos` é formatada de uma vez, só nos valores distintos; a
+    tabela apenas consulta o texto de cada valor. Os dados continuam numéricos,
+    então a ordenação das colunas no `st.dataframe` segue correta.
+    """
+    formatadores = {}
+    for coluna, formatador in formatos.items():
+        if coluna in df.columns:
+            unicos = pd.Series(df[coluna].dropna().unique())
+            formatadores[coluna] = dict(zip(unicos, formatador(unicos))).get
+    return formatadores
+
+
+# Formato de exibição/exportação das colunas da tabela de cupons
+FORMATOS_CUPONS = {
+    "Quantidade Comprada": formatar_float_serie,
+    "Ativacao Necessaria": formatar_inteiro_serie,
+    "Preco Venda Unidade": formatar_moeda_serie,
+    "Preco Venda Promocao": formatar_moeda_serie,
+    "Desconto Unitario": formatar_moeda_serie,
+    "Desconto Total": formatar_moeda_serie,
+    "Percentual Desconto": formatar_percentual_serie,
+    "Custo Produto": formatar_moeda_serie,
+    "Margem Produto": formatar_percentual_serie,
+    "Margem Promocao": formatar_percentual_serie,
+}
 
 
 def carregar_arquivo_csv(caminho):
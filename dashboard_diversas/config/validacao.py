@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+
+import config.config_interface as config_interface
+
+# Versão das regras e da normalização feitas na carga. Mudar sempre que elas mudarem:
+# os arquivos já validados no conjunto compartilhado deixam de valer.
+VERSAO_REGRAS = 4
+
+# Colunas monetárias arredondadas para centavos na carga. O custo do produto
+# fica com a precisão original: é um custo médio multiplicado pela quantidade.
+COLUNAS_MOEDA = [
+    "Preco Venda Unidade",
+    "Preco Venda Promocao",
+    "Desconto Unitario",
+    "Desconto Total",
+]
+
+# Regras de validação, na ordem em que aparecem na contagem por arquivo
+REGRAS = {
+    "custo_invalido": "Custo Produto zerado ou negativo",
+    "desconto_atipico": "Percentual Desconto fora do intervalo esperado",
+    "desconto_inconsistente": (
+        "Desconto Unitario diferente de Preco Venda Unidade - Preco Venda Promocao"
+    ),
+    "sku_fora_relatorio": "SKU ausente do relatório de promoções",
+}
+
+COLUNAS_ANOMALIAS = [
+    "Arquivo",
+    "Linha",
+    "Regra",
+    "Loja",
+    "Num.Cupom",
+    "SKU",
+    "Familia",
+    "Data Cupom",
+    "Valor",
+]
+
+
+def _avaliar_regras(dados, skus_relatorio):
+    """Máscaras booleanas de cada regra e o valor exibido na tabela de anomalias
+    (None quando a regra não tem valor numérico)."""
+    custo = dados["Custo Produto"]
+    percentual = dados["Percentual Desconto"]
+    desconto_esperado = (dados["Preco Venda Unidade"] - dados["Preco Venda Promocao"]).round(2)
+
+    return {
+        "custo_invalido": (~(custo > 0), custo),
+        "desconto_atipico": (
+            ~percentual.between(
+                config_interface.PERCENTUAL_DESCONTO_MINIMO,
+                config_interface.PERCENTUAL_DESCONTO_MAXIMO,
+            ),
+            percentual,
+        ),
+        "desconto_inconsistente": (
+            (dados["Desconto Unitario"] - desconto_esperado).abs() > 0.005,
+            dados["Desconto Unitario"],
+        ),
+        # O SKU já tem coluna própria na tabela de anomalias: sem valor numérico
+        "sku_fora_relatorio": (~dados["SKU"].astype(str).isin(skus_relatorio), None),
+    }
+
+
+def validar_cupons(dados, skus_relatorio, arquivo=""):
+    """Valida um arquivo de cupons inteiro de uma vez.
+
+    Arredonda as colunas monetárias para centavos, converte `Data Cupom` para data
+    e avalia as regras de `REGRAS` sobre o DataFrame todo. As linhas não são
+    removidas: as anomalias vão para uma tabela à parte, com a linha do arquivo
+    CSV em `Linha` (a linha 1 é o cabeçalho). Retorna um dicionário com `dados`,
+    `anomalias` e `contagem`.
+    """
+    dados = dados.copy()
+    if dados.empty:
+        contagem = {"Arquivo": arquivo, "Linhas": 0, **{regra: 0 for regra in REGRAS}}
+        return {
+            "dados": dados,
+            "anomalias": pd.DataFrame(columns=COLUNAS_ANOMALIAS),
+            "contagem": contagem,
+        }
+
+    dados[COLUNAS_MOEDA] = dados[COLUNAS_MOEDA].round(2)
+    dados["Data Cupom"] = pd.to_datetime(dados["Data Cupom"])
+
+    anomalias = []
+    contagem = {"Arquivo": arquivo, "Linhas": len(dados)}
+    for regra, (mascara, valores) in _avaliar_regras(dados, skus_relatorio).items():
+        mascara = mascara.to_numpy()
+        contagem[regra] = int(mascara.sum())
+        if not mascara.any():
+            continue
+
+        linhas = dados.loc[mascara, ["Loja", "Num.Cupom", "SKU", "Familia", "Data Cupom"]]
+        anomalias.append(
+            linhas.assign(
+                Arquivo=arquivo,
+                Linha=np.flatnonzero(mascara) + 2,
+                Regra=regra,
+                Valor=np.nan if valores is None else valores[mascara].to_numpy(),
+            )
+        )
+
+    anomalias = (
+        pd.concat(anomalias, ignore_index=True)[COLUNAS_ANOMALIAS]
+        if anomalias
+        else pd.DataFrame(columns=COLUNAS_ANOMALIAS)
+    )
+    return {"dados": dados, "anomalias": anomalias, "contagem": contagem}
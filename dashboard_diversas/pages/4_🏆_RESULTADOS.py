@@ -1,16 +1,8 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px  # Biblioteca para gráficos interativos
 
-# Dicionário de mapeamento das lojas
-mapeamento_lojas = {
-    "1": "Espera Feliz 1",
-    "2": "Caiana",
-    "3": "Divino 1",
-    "5": "Alto Jequitibá",
-    "6": "Divino 2",
-    "8": "Espera Feliz 2",
-}
+from config.lojas import codigos_lojas, nomes_lojas
+from config.relatorios import lojas_agregadas, resumir_itens
 
 
 def criar_grafico_barras(
@@ -122,45 +114,26 @@ def criar_grafico_pizza(df, nome_col, valor_col, titulo, limite=15):
     return fig
 
 
-# Criando um dicionário inverso para buscar os códigos das lojas a partir dos nomes
-mapeamento_inverso_lojas = {v: k for k, v in mapeamento_lojas.items()}
+# Agregados por loja da promoção selecionada (calculados na página de insights)
+agregados = st.session_state["agregados_promocao"]
 
-df = st.session_state["dados_filtrados_promocao"]
-df["Data Cupom"] = pd.to_datetime(df["Data Cupom"])  # Converter para datetime
+# Lojas presentes na promoção atual
+lojas_nomes = nomes_lojas(lojas_agregadas(agregados))
 
-# Filtrando apenas as lojas que estão no dataframe atual
-lojas_disponiveis = df["Loja"].astype(str).unique()
-lojas_nomes = [mapeamento_lojas[loja] for loja in lojas_disponiveis if loja in mapeamento_lojas]
+# Seleção de uma ou mais lojas; os resultados somam as lojas escolhidas
+seletor_lojas = st.sidebar.multiselect("Lojas: ", lojas_nomes, default=lojas_nomes[:1])
+if not seletor_lojas:
+    st.warning("Selecione ao menos uma loja.")
+    st.stop()
 
-# Selectbox com nomes das lojas
-seletor_loja = st.sidebar.selectbox("Lojas: ", lojas_nomes)
+# Converter os nomes das lojas selecionadas de volta para os códigos
+lojas = codigos_lojas(seletor_lojas)
 
-# Converter o nome da loja selecionada de volta para o código
-codigo_loja = mapeamento_inverso_lojas[seletor_loja]
-
-# Filtrar o dataframe pela loja selecionada
-df_filtrado_loja = df[df["Loja"].astype(str) == codigo_loja]
-
-# Agrupar por Nome do Item para calcular as métricas
-df_resumo = (
-    df_filtrado_loja.groupby("Familia")
-    .agg(
-        Quantidade_Vendida=("Quantidade Comprada", "sum"),
-        Dias_Ativado=("Data Cupom", pd.Series.nunique),
-        Vezes_Ativado=(
-            "Num.Cupom",
-            lambda x: (
-                df_filtrado_loja.loc[x.index, "Quantidade Comprada"]
-                >= df_filtrado_loja.loc[x.index, "Ativacao Necessaria"]
-            ).sum(),
-        ),
-        Faturamento=("Preco Venda Promocao", "sum"),
-    )
-    .reset_index()
-)
+# Métricas por item das lojas selecionadas
+df_resumo = resumir_itens(agregados, lojas)
 
 # Exibir título
-st.title(f"🏬 Análise da Loja {seletor_loja}")
+st.title(f"🏬 Análise da Loja {', '.join(seletor_lojas)}")
 
 # Criar gráficos para cada métrica
 
@@ -0,0 +1,110 @@
+import time
+
+import numpy as np
+import plotly.express as px
+import streamlit as st
+
+from config.simulador import (
+    ELASTICIDADE_PADRAO,
+    preparar_linhas,
+    simular_cenarios,
+    varrer_precos_por_sku,
+)
+from config.utils import formatar_moeda
+
+df = st.session_state["dados_filtrados_promocao"]
+custo_encarte_atual = st.session_state.get("custo_encarte_promocao", 3600)
+
+# --- PARÂMETROS DO CENÁRIO ---
+st.sidebar.subheader("Parâmetros do Cenário")
+variacao_min, variacao_max = st.sidebar.slider(
+    "Variação do Preço Promocional (%)", min_value=-50, max_value=50, value=(-30, 30)
+)
+pontos = st.sidebar.slider("Pontos de Preço", min_value=5, max_value=200, value=50)
+ajuste_ativacao = st.sidebar.number_input(
+    "Ajuste na Ativação Necessária", min_value=-5, max_value=10, value=0, step=1
+)
+elasticidade = st.sidebar.slider(
+    "Elasticidade-Preço da Demanda",
+    min_value=-5.0,
+    max_value=-0.1,
+    value=ELASTICIDADE_PADRAO,
+    step=0.1,
+    help="Variação % da quantidade vendida para cada 1% de aumento no preço promocional.",
+)
+custo_encarte = st.sidebar.number_input(
+    "Custo do Tabloide (R$)", min_value=0.0, value=float(custo_encarte_atual), step=100.0
+)
+
+# Fatores aplicados sobre o preço promocional observado (1.0 = preço atual)
+fatores = 1 + np.linspace(variacao_min, variacao_max, pontos) / 100
+
+# --- SIMULAÇÃO ---
+inicio = time.perf_counter()
+linhas = preparar_linhas(df)
+df_cenarios = simular_cenarios(linhas, fatores, custo_encarte, ajuste_ativacao, elasticidade)
+df_varredura = varrer_precos_por_sku(linhas, fatores, custo_encarte, ajuste_ativacao, elasticidade)
+tempo_simulacao = time.perf_counter() - inicio
+
+df_cenarios["Variacao %"] = (df_cenarios["Fator Preco"] - 1) * 100
+
+# --- EXIBIÇÃO NO DASHBOARD ---
+st.title("🧮 Simulador de Lucratividade do Tabloide")
+st.caption(
+    f"{len(fatores)} pontos de preço x {len(linhas['skus'])} SKUs "
+    f"({len(linhas['quantidade'])} linhas de cupom) simulados em {tempo_simulacao * 1000:.0f} ms"
+)
+
+melhor = df_cenarios.loc[df_cenarios["Lucro Liquido"].idxmax()]
+
+col1, col2, col3 = st.columns(3)
+col1.metric("Melhor Variação de Preço", f"{melhor['Variacao %']:.1f}%")
+col2.metric("Lucro Líquido no Melhor Cenário", formatar_moeda(melhor["Lucro Liquido"]))
+col3.metric("Meta de Lucro no Melhor Cenário", formatar_moeda(melhor["Meta Lucro"]))
+
+fig = px.line(
+    df_cenarios,
+    x="Variacao %",
+    y=["Lucro Liquido", "Meta Lucro"],
+    title="📈 Lucro Líquido por Variação do Preço Promocional",
+)
+fig.update_layout(
+    xaxis_title="Variação do Preço Promocional (%)",
+    yaxis_title="R$",
+    legend_title_text="",
+)
+st.plotly_chart(fig, use_container_width=True)
+
+st.divider()
+
+# --- VARREDURA POR SKU ---
+st.subheader("📦 Melhor Preço por SKU (variando um SKU por vez)")
+
+nomes_sku = df.assign(SKU=df["SKU"].astype(str)).groupby("SKU", observed=True)["Familia"].first()
+lucro_base = simular_cenarios(linhas, [1.0], custo_encarte, ajuste_ativacao, elasticidade)[
+    "Lucro Liquido"
+][0]
+melhor_fator = df_varredura.idxmax()
+
+df_por_sku = (
+    melhor_fator.rename("Melhor Fator")
+    .to_frame()
+    .assign(
+        Familia=nomes_sku.reindex(df_varredura.columns).to_numpy(),
+        Ganho=df_varredura.max().to_numpy() - lucro_base,
+    )
+    .sort_values("Ganho", ascending=False)
+    .reset_index(names="SKU")
+)
+df_por_sku["Variacao %"] = (df_por_sku["Melhor Fator"] - 1) * 100
+
+st.dataframe(
+    df_por_sku[["SKU", "Familia", "Variacao %", "Ganho"]],
+    use_container_width=True,
+    hide_index=True,
+    column_config={
+        "Familia": st.column_config.TextColumn("Item"),
+        "Variacao %": st.column_config.NumberColumn("Variação de Preço", format="%.1f %%"),
+        "Ganho": st.column_config.NumberColumn("Ganho no Lucro Líquido", format="R$ %.2f"),
+    },
+)
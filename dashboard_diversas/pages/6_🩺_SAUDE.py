@@ -0,0 +1,46 @@
+import pandas as pd
+import streamlit as st
+from config.inicializacao import aquecer, estado_aquecimento
+
+st.set_page_config(page_title="Saúde do App", page_icon="🩺", layout="wide")
+
+st.title("Saúde do App")
+
+estado = estado_aquecimento()
+
+if estado["aquecido"]:
+    st.success(
+        "Aquecido: relatório, catálogo e arquivos mensais publicados no conjunto compartilhado."
+    )
+else:
+    st.warning("Frio: há quadros sem publicar ou desatualizados; o próximo acesso lê os CSVs.")
+    if st.button("Aquecer Agora 🔥"):
+        with st.spinner("Publicando o conjunto compartilhado..."):
+            aquecer()
+        st.rerun()
+
+col1, col2, col3 = st.columns(3)
+col1.metric("Meses em Memória", estado["meses_em_memoria"])
+col2.metric("Promoções em Cache", estado["promocoes_em_cache"])
+col3.metric("Cache de Promoções (MB)", f"{estado['bytes_em_cache'] / 1024 / 1024:.1f}")
+
+st.subheader("Conjunto Compartilhado")
+st.dataframe(
+    pd.DataFrame(
+        {
+            "Quadro": list(estado["publicados"]),
+            "Publicado": ["✅" if ok else "❌" for ok in estado["publicados"].values()],
+        }
+    ),
+    use_container_width=True,
+    hide_index=True,
+)
+
+# Segundos desde o início do processo, na primeira vez que cada etapa terminou
+st.subheader("Perfil da Inicialização")
+st.caption(f"Segundos desde o {estado['origem_marcos']} até o fim de cada etapa.")
+st.dataframe(
+    pd.DataFrame({"Etapa": list(estado["marcos"]), "Segundos": list(estado["marcos"].values())}),
+    use_container_width=True,
+    hide_index=True,
+)
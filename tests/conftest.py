@@ -0,0 +1,10 @@
+import pytest
+
+from tests.kpis import conjunto_temporario
+
+
+@pytest.fixture(scope="session", autouse=True)
+def conjunto_compartilhado_isolado():
+    """Os testes nunca leem nem escrevem o conjunto compartilhado do app."""
+    with conjunto_temporario() as pasta:
+        yield pasta
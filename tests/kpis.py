@@ -0,0 +1,150 @@
+"""Cálculo de todos os indicadores exibidos pelas páginas, para cada tabloide de 2024.
+
+Regenerar os arquivos de referência (só quando uma mudança de regra for intencional,
+registrando o efeito em tests/golden/HISTORICO.md):
+
+    python -m tests.kpis
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+import pandas as pd
+
+PASTA_APP = Path(__file__).resolve().parents[1] / "dashboard_diversas"
+PASTA_GOLDEN = Path(__file__).resolve().parent / "golden"
+
+# Os módulos da aplicação são importados como `config.*`, a partir da pasta do app
+if str(PASTA_APP) not in sys.path:
+    sys.path.insert(0, str(PASTA_APP))
+
+import config.config_interface as config_interface  # noqa: E402
+from config import dados  # noqa: E402
+from config.dados import analisar_promocao, carregar_dados  # noqa: E402
+from config.relatorios import (  # noqa: E402
+    FATOR_META_LUCRO,
+    resumir_familias,
+    resumir_itens_por_loja,
+)
+
+COLUNAS_INSIGHTS = [
+    "Cupons_Ativados",
+    "Itens_Ativados",
+    "Itens_Vendidos",
+    "Desconto_Total",
+    "Receita_Bruta",
+    "Lucro_Bruto",
+    "Lucro_Liquido",
+    "Custo_Total",
+]
+
+# Chaves de cada tabela de referência
+CHAVES = {
+    "insights": ["Tabloide"],
+    "familias": ["Tabloide", "Loja", "Familia"],
+    "itens_por_loja": ["Tabloide", "Loja", "Familia"],
+}
+
+
+@contextmanager
+def na_pasta_app():
+    """Os caminhos de `config_interface` são relativos à pasta do app."""
+    pasta_anterior = os.getcwd()
+    os.chdir(PASTA_APP)
+    try:
+        yield
+    finally:
+        os.chdir(pasta_anterior)
+
+
+@contextmanager
+def conjunto_temporario():
+    """Conjunto compartilhado vazio e caches limpos: tudo é lido dos CSVs e validado
+    pelo código atual, sem tocar no conjunto publicado do app."""
+    pasta_anterior = config_interface.PASTA_COMPARTILHADA
+    pasta = tempfile.mkdtemp(prefix="conjunto-testes-")
+    config_interface.PASTA_COMPARTILHADA = pasta + os.sep
+    _limpar_caches()
+    try:
+        yield pasta
+    finally:
+        config_interface.PASTA_COMPARTILHADA = pasta_anterior
+        _limpar_caches()
+        shutil.rmtree(pasta, ignore_errors=True)
+
+
+def _limpar_caches():
+    for funcao in (dados._catalogo_promocoes, dados._skus_relatorio, dados._carregar_mes_validado):
+        funcao.cache_clear()
+
+
+def listar_tabloides():
+    """Tabloides do relatório com o período usado na página de insights."""
+    relatorio = carregar_dados()
+    relatorio["Data Inicial"] = pd.to_datetime(relatorio["Data Inicial"])
+    relatorio["Data Final"] = pd.to_datetime(relatorio["Data Final"])
+    relatorio["Tabloide"] = (
+        relatorio["Nome Promocao"].astype(str).str.extract(r"^(TABLOIDE \d+ A \d+)", expand=False)
+    )
+    return (
+        relatorio.dropna(subset=["Tabloide"])
+        .groupby("Tabloide")
+        .agg(inicio=("Data Inicial", "min"), fim=("Data Final", "max"))
+        .sort_values("inicio")
+    )
+
+
+def calcular_kpis():
+    """Tabelas `insights`, `familias` e `itens_por_loja` de todos os tabloides."""
+    insights, familias, itens_por_loja = [], [], []
+
+    with na_pasta_app():
+        for tabloide, periodo in listar_tabloides().iterrows():
+            analise = analisar_promocao(periodo["inicio"], periodo["fim"])
+            if analise["insights"] is None:
+                continue
+
+            linha = dict(zip(COLUNAS_INSIGHTS, analise["insights"]))
+            linha["Tabloide"] = tabloide
+            linha["Custo_Tabloide"] = analise["custo_encarte"]
+            linha["Meta_Lucro"] = linha["Custo_Total"] * FATOR_META_LUCRO
+            insights.append(linha)
+
+            agregados = analise["agregados"]
+            familias.append(resumir_familias(agregados).assign(Tabloide=tabloide))
+            itens_por_loja.append(resumir_itens_por_loja(agregados).assign(Tabloide=tabloide))
+
+    tabelas = {
+        "insights": pd.DataFrame(insights),
+        "familias": pd.concat(familias, ignore_index=True),
+        "itens_por_loja": pd.concat(itens_por_loja, ignore_index=True),
+    }
+    return {nome: _normalizar(tabela, CHAVES[nome]) for nome, tabela in tabelas.items()}
+
+
+def _normalizar(tabela, chaves):
+    """Ordena pelas chaves e deixa datas como texto, para comparar com o CSV."""
+    tabela = tabela[chaves + [col for col in tabela.columns if col not in chaves]].copy()
+    for coluna in tabela.select_dtypes("datetime").columns:
+        tabela[coluna] = tabela[coluna].dt.strftime("%Y-%m-%d")
+    return tabela.sort_values(chaves).reset_index(drop=True)
+
+
+def carregar_golden(nome):
+    return pd.read_csv(PASTA_GOLDEN / f"{nome}.csv", sep=";", decimal=",", dtype={"Loja": str})
+
+
+def salvar_golden():
+    PASTA_GOLDEN.mkdir(exist_ok=True)
+    for nome, tabela in calcular_kpis().items():
+        # Valores monetários e médias guardados com precisão de centavos
+        tabela.round(2).to_csv(PASTA_GOLDEN / f"{nome}.csv", sep=";", decimal=",", index=False)
+
+
+if __name__ == "__main__":
+    with conjunto_temporario():
+        salvar_golden()
@@ -0,0 +1,39 @@
+import pandas as pd
+import pytest
+
+from tests.kpis import listar_tabloides, na_pasta_app
+from config.compartilhado import coluna_mapeada
+from config.dados import carregar_cupons_promocao, validar_meses
+
+
+@pytest.fixture(scope="module")
+def tabloides():
+    with na_pasta_app():
+        return listar_tabloides()
+
+
+def _filtrar_meses(inicio, fim):
+    # Regra anterior: todos os meses do período inteiros, filtrados pela data do cupom
+    with na_pasta_app():
+        meses = pd.concat([resultado["dados"] for resultado in validar_meses(inicio, fim)])
+    return meses[meses["Data Cupom"].between(inicio, fim)].reset_index(drop=True)
+
+
+def test_promocao_de_um_mes_sao_visoes_do_conjunto_compartilhado(tabloides):
+    periodo = tabloides[tabloides["inicio"].dt.month == tabloides["fim"].dt.month].iloc[0]
+    with na_pasta_app():
+        cupons = carregar_cupons_promocao(periodo["inicio"], periodo["fim"])
+
+    assert all(coluna_mapeada(cupons[coluna]) for coluna in cupons.columns)
+    pd.testing.assert_frame_equal(
+        cupons.reset_index(drop=True), _filtrar_meses(periodo["inicio"], periodo["fim"])
+    )
+
+
+def test_promocao_que_cruza_meses_junta_as_fatias_de_cada_mes(tabloides):
+    periodo = tabloides[tabloides["inicio"].dt.month != tabloides["fim"].dt.month].iloc[0]
+    with na_pasta_app():
+        cupons = carregar_cupons_promocao(periodo["inicio"], periodo["fim"])
+
+    assert cupons["Data Cupom"].dt.month.nunique() == 2
+    pd.testing.assert_frame_equal(cupons, _filtrar_meses(periodo["inicio"], periodo["fim"]))
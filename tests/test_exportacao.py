@@ -0,0 +1,54 @@
+import io
+import os
+import zipfile
+
+import pandas as pd
+
+from tests.kpis import listar_tabloides, na_pasta_app
+from config.dados import analisar_promocao
+import config.exportacao as exportacao
+from config.exportacao import gerar_arquivo_exportacao
+
+
+def _ler_csv(caminho, nome):
+    with zipfile.ZipFile(caminho) as pacote:
+        return pd.read_csv(io.BytesIO(pacote.read(nome)), sep=";", encoding="utf-8-sig", dtype=str)
+
+
+def test_zip_reaproveitado_por_versao_e_indicadores_sem_casas_nas_contagens(tmp_path):
+    with na_pasta_app():
+        periodo = listar_tabloides().iloc[0]
+        chave = (periodo["inicio"], periodo["fim"])
+        analise = analisar_promocao(*chave)
+
+    chamadas = []
+
+    def obter_analise():
+        chamadas.append(chave)
+        return analise
+
+    caminho = gerar_arquivo_exportacao(chave, (1.0,), obter_analise, tmp_path)
+    assert gerar_arquivo_exportacao(chave, (1.0,), obter_analise, tmp_path) == caminho
+    assert len(chamadas) == 1
+
+    indicadores = _ler_csv(caminho, "indicadores.csv").set_index("Indicador")["Valor"]
+    assert indicadores["Nº Cupons Ativados"] == str(analise["insights"][0])
+    assert indicadores["Total Desconto"] == f"{analise['insights'][3]:.2f}".replace(".", ",")
+
+    # Arquivos de origem atualizados: novo ZIP, e o antigo é removido
+    novo = gerar_arquivo_exportacao(chave, (2.0,), obter_analise, tmp_path)
+    assert novo != caminho
+    assert len(chamadas) == 2
+    assert [arquivo.name for arquivo in tmp_path.iterdir()] == [os.path.basename(novo)]
+
+
+def test_mudanca_no_conteudo_do_pacote_gera_novo_zip(tmp_path, monkeypatch):
+    chave = (pd.Timestamp("2024-01-01"), pd.Timestamp("2024-01-10"))
+    monkeypatch.setattr(exportacao, "exportar_promocao", lambda analise, destino: None)
+
+    caminho = gerar_arquivo_exportacao(chave, (1.0,), lambda: None, tmp_path)
+    monkeypatch.setattr(exportacao, "VERSAO_EXPORTACAO", exportacao.VERSAO_EXPORTACAO + 1)
+    novo = gerar_arquivo_exportacao(chave, (1.0,), lambda: None, tmp_path)
+
+    assert novo != caminho
+    assert [arquivo.name for arquivo in tmp_path.iterdir()] == [os.path.basename(novo)]
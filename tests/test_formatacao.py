@@ -0,0 +1,37 @@
+import pandas as pd
+import pytest
+
+import tests.kpis  # noqa: F401  (coloca a pasta do app no sys.path)
+from config.utils import (
+    formatadores_exibicao,
+    formatar_float,
+    formatar_float_serie,
+    formatar_inteiro,
+    formatar_inteiro_serie,
+    formatar_moeda,
+    formatar_moeda_serie,
+)
+
+VALORES = [0.005, 0.015, 2.5, 3.5, 1234.565, 1_000_000.0, -7.125, 0.0, 42.0]
+
+
+@pytest.mark.parametrize(
+    "formatar_serie, formatar_valor",
+    [
+        (formatar_moeda_serie, formatar_moeda),
+        (formatar_float_serie, formatar_float),
+        (formatar_inteiro_serie, formatar_inteiro),
+    ],
+)
+def test_formatador_de_serie_igual_ao_escalar(formatar_serie, formatar_valor):
+    serie = pd.Series(VALORES + [None])
+    assert formatar_serie(serie).tolist() == [formatar_valor(valor) for valor in VALORES] + [""]
+
+
+def test_formatadores_de_exibicao_mantem_os_dados_numericos():
+    df = pd.DataFrame({"Preco": [10.0, 2.0, 10.0], "Nome": ["a", "b", "c"]})
+    formatadores = formatadores_exibicao(df, {"Preco": formatar_moeda_serie, "Ausente": None})
+
+    assert list(formatadores) == ["Preco"]
+    assert formatadores["Preco"](2.0) == "R$ 2,00"
+    assert df.style.format(formatadores).data["Preco"].tolist() == [10.0, 2.0, 10.0]
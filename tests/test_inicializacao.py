@@ -0,0 +1,67 @@
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+
+from tests.kpis import PASTA_APP, na_pasta_app
+
+
+def test_entrada_nao_importa_bibliotecas_pesadas():
+    # Mesmas importações de config feitas pela página de insights
+    codigo = (
+        "import sys\n"
+        "import config.inicializacao, config.utils, config.dados, config.prefetch\n"
+        "import config.validacao\n"
+        "print(' '.join(m for m in ['plotly', 'openpyxl', 'xlsxwriter'] if m in sys.modules))\n"
+    )
+    saida = subprocess.run(
+        [sys.executable, "-c", codigo], cwd=PASTA_APP, capture_output=True, text=True, check=True
+    )
+    assert saida.stdout.strip() == ""
+
+
+def test_catalogo_igual_ao_montado_pela_pagina():
+    from config.dados import carregar_catalogo_promocoes, carregar_dados
+
+    with na_pasta_app():
+        catalogo = carregar_catalogo_promocoes()
+        relatorio = carregar_dados()
+
+    # Derivação que a página de insights fazia a cada reexecução
+    nome = relatorio["Nome Promocao"].astype(str).str.extract(r"^(TABLOIDE \d+ A \d+)")[0]
+    inicio = pd.to_datetime(relatorio["Data Inicial"])
+    fim = pd.to_datetime(relatorio["Data Final"])
+    rotulos = (
+        nome
+        + " - "
+        + inicio.dt.strftime("%d/%m")
+        + " A "
+        + fim.dt.strftime("%d/%m")
+        + " - "
+        + inicio.dt.year.astype(str)
+    )
+
+    assert list(catalogo["Nome Agrupado com Mês"].dropna().unique()) == list(
+        rotulos.dropna().unique()
+    )
+    assert catalogo["Data Inicial"].min() == inicio.min()
+    assert catalogo["Data Final"].max() == fim.max()
+
+
+def test_marcos_contam_do_inicio_do_processo():
+    # O processo espera antes de importar o módulo: no Linux esse tempo entra no marco
+    codigo = (
+        "import time\n"
+        "time.sleep(0.5)\n"
+        "from config.inicializacao import ORIGEM_MARCOS, marcos, registrar_marco\n"
+        "registrar_marco('importado')\n"
+        "print(ORIGEM_MARCOS, marcos()['importado'], sep=';')\n"
+    )
+    saida = subprocess.run(
+        [sys.executable, "-c", codigo], cwd=PASTA_APP, capture_output=True, text=True, check=True
+    )
+    origem, segundos = saida.stdout.strip().split(";")
+    if origem != "início do processo":
+        pytest.skip("sistema sem /proc: os marcos contam da importação")
+    assert float(segundos) >= 0.5
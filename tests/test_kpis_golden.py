@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tests.kpis import CHAVES, calcular_kpis, carregar_golden, na_pasta_app
+
+# Diferença máxima aceita: meio centavo (os arquivos de referência têm 2 casas)
+TOLERANCIA = 0.005 + 1e-9
+
+
+@pytest.fixture(scope="module")
+def kpis():
+    return calcular_kpis()
+
+
+@pytest.mark.parametrize("nome", list(CHAVES))
+def test_kpis_iguais_aos_de_referencia(kpis, nome):
+    chaves = CHAVES[nome]
+    golden = carregar_golden(nome)
+    atual = kpis[nome]
+
+    assert list(atual.columns) == list(golden.columns)
+
+    comparacao = golden.merge(
+        atual, on=chaves, how="outer", suffixes=("_golden", "_atual"), indicator=True
+    )
+    faltando = comparacao[comparacao["_merge"] != "both"]
+    assert faltando.empty, f"Linhas diferentes das de referência:\n{faltando[chaves + ['_merge']]}"
+
+    for coluna in golden.columns.difference(chaves):
+        esperado = comparacao[f"{coluna}_golden"]
+        obtido = comparacao[f"{coluna}_atual"]
+
+        if pd.api.types.is_numeric_dtype(esperado):
+            diferenca = np.abs(obtido.astype(float) - esperado.astype(float))
+            divergentes = ~((diferenca <= TOLERANCIA) | (esperado.isna() & obtido.isna()))
+        else:
+            divergentes = esperado != obtido
+
+        assert not divergentes.any(), (
+            f"{nome}.{coluna} diverge da referência:\n"
+            f"{comparacao.loc[divergentes, chaves + [f'{coluna}_golden', f'{coluna}_atual']]}"
+        )
+
+
+def test_simulador_no_preco_atual_reproduz_insights(kpis):
+    from config.dados import analisar_promocao
+    from config.simulador import preparar_linhas, simular_cenarios
+    from tests.kpis import listar_tabloides
+
+    with na_pasta_app():
+        tabloides = listar_tabloides()
+        for tabloide, linha in kpis["insights"].set_index("Tabloide").iterrows():
+            periodo = tabloides.loc[tabloide]
+            analise = analisar_promocao(periodo["inicio"], periodo["fim"])
+            cenario = simular_cenarios(
+                preparar_linhas(analise["cupons"]), [1.0], linha["Custo_Tabloide"]
+            ).iloc[0]
+
+            assert cenario["Lucro Liquido"] == pytest.approx(linha["Lucro_Liquido"], abs=TOLERANCIA)
+            assert cenario["Meta Lucro"] == pytest.approx(linha["Meta_Lucro"], abs=TOLERANCIA)
@@ -0,0 +1,31 @@
+import pandas as pd
+import pytest
+
+from tests.kpis import listar_tabloides, na_pasta_app
+from config.dados import analisar_promocao
+from config.lojas import codigos_lojas, nomes_lojas, normalizar_codigo_loja
+from config.relatorios import agregar_lojas, resumir_itens
+
+LOJAS = {"1", "3"}
+
+
+@pytest.fixture(scope="module")
+def analise():
+    with na_pasta_app():
+        periodo = listar_tabloides().iloc[0]
+        return analisar_promocao(periodo["inicio"], periodo["fim"])
+
+
+def _agregados_das_lojas(cupons, lojas):
+    return agregar_lojas(cupons[cupons["Loja"].map(normalizar_codigo_loja).isin(lojas)])
+
+
+def test_itens_das_lojas_saem_dos_agregados_sem_voltar_aos_cupons(analise):
+    esperado = resumir_itens(_agregados_das_lojas(analise["cupons"], LOJAS))
+
+    pd.testing.assert_frame_equal(resumir_itens(analise["agregados"], LOJAS), esperado)
+
+
+def test_codigos_e_nomes_das_lojas():
+    assert normalizar_codigo_loja("01") == normalizar_codigo_loja(1) == "1"
+    assert codigos_lojas(nomes_lojas(["3", "1", "99"])) == LOJAS
@@ -0,0 +1,58 @@
+import threading
+
+import pandas as pd
+import pytest
+
+import tests.kpis  # noqa: F401  (coloca a pasta do app no sys.path)
+import config.prefetch as prefetch
+
+
+@pytest.fixture
+def origem(monkeypatch):
+    """Análise falsa e controlável: conta as execuções e pode segurar a thread."""
+    estado = {"versao": (1.0,), "execucoes": [], "liberar": threading.Event()}
+    estado["liberar"].set()
+
+    def analisar(inicio, fim):
+        estado["liberar"].wait()
+        estado["execucoes"].append((inicio, fim))
+        return {"cupons": pd.DataFrame({"valor": [len(estado["execucoes"])]})}
+
+    monkeypatch.setattr(prefetch, "analisar_promocao", analisar)
+    monkeypatch.setattr(prefetch, "versao_promocao", lambda inicio, fim: estado["versao"])
+    return estado
+
+
+def test_arquivo_atualizado_nao_e_servido_do_cache(origem):
+    prefetcher = prefetch.PrefetcherPromocoes(max_threads=1)
+    chave = (pd.Timestamp("2024-08-01"), pd.Timestamp("2024-08-10"))
+
+    primeira = prefetcher.obter(chave)
+    assert prefetcher.obter(chave) is primeira
+
+    origem["versao"] = (2.0,)
+    assert prefetcher.obter(chave) is not primeira
+    assert len(origem["execucoes"]) == 2
+
+
+def test_selecao_de_uma_sessao_nao_cancela_as_de_outra(origem):
+    prefetcher = prefetch.PrefetcherPromocoes(max_threads=1)
+    chaves = [
+        (pd.Timestamp(f"2024-0{mes}-01"), pd.Timestamp(f"2024-0{mes}-10")) for mes in range(1, 7)
+    ]
+
+    # Segura a única thread para que os agendamentos fiquem pendentes
+    origem["liberar"].clear()
+    prefetcher.agendar_vizinhas(chaves, 4, sessao="ocupa")
+    prefetcher.agendar_vizinhas(chaves, 1, sessao="a")
+    prefetcher.agendar_vizinhas(chaves, 2, sessao="b")  # vizinhas 1 e 3 (a 2 é de "a")
+
+    # Nova seleção de "a": só o que "b" não quer é cancelado
+    prefetcher.agendar_vizinhas(chaves, 5, sessao="a")  # vizinha 4
+    origem["liberar"].set()
+    prefetcher._executor.shutdown(wait=True)
+
+    assert chaves[1] in origem["execucoes"]  # só "b" queria
+    assert chaves[3] in origem["execucoes"]
+    assert chaves[0] not in origem["execucoes"]  # só "a" queria; canceladas
+    assert chaves[2] not in origem["execucoes"]
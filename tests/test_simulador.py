@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import tests.kpis  # noqa: F401  (coloca a pasta do app no sys.path)
+from config.simulador import preparar_linhas, simular_cenarios, varrer_precos_por_sku
+
+CUSTO_ENCARTE = 100.0
+
+
+@pytest.fixture
+def linhas():
+    # Duas linhas no limite da ativação e uma acima dele; custo bem abaixo do preço
+    cupons = pd.DataFrame(
+        {
+            "SKU": [1, 1, 2],
+            "Quantidade Comprada": [3.0, 3.0, 10.0],
+            "Ativacao Necessaria": [3, 3, 2],
+            "Preco Venda Unidade": [12.0, 12.0, 6.0],
+            "Preco Venda Promocao": [10.0, 10.0, 5.0],
+            "Custo Produto": [6.0, 6.0, 3.0],
+            "Desconto Total": [6.0, 6.0, 10.0],
+        }
+    )
+    return preparar_linhas(cupons)
+
+
+@pytest.mark.parametrize("elasticidade", [-0.5, -2.0, -4.0])
+def test_preco_atual_reproduz_regra_dos_insights(linhas, elasticidade):
+    cenario = simular_cenarios(linhas, [1.0], CUSTO_ENCARTE, elasticidade=elasticidade).iloc[0]
+
+    # Lucro bruto 4*3 + 4*3 + 2*10 = 44; desconto 22
+    assert cenario["Lucro Bruto"] == pytest.approx(44.0)
+    assert cenario["Desconto Total"] == pytest.approx(22.0)
+    assert cenario["Lucro Liquido"] == pytest.approx(44.0 - 22.0 - CUSTO_ENCARTE)
+
+
+def test_lucro_nao_cresce_sempre_com_o_preco(linhas):
+    fatores = 1 + np.linspace(-0.3, 0.3, 25)
+    lucro = simular_cenarios(linhas, fatores, CUSTO_ENCARTE, elasticidade=-2.0)["Lucro Liquido"]
+
+    assert not lucro.is_monotonic_increasing
+    assert fatores[lucro.idxmax()] < fatores[-1]
+
+
+def test_aumentar_a_ativacao_nao_aumenta_o_lucro(linhas):
+    lucros = [
+        simular_cenarios(linhas, [1.0], CUSTO_ENCARTE, ajuste)["Lucro Liquido"][0]
+        for ajuste in range(0, 4)
+    ]
+    assert lucros == sorted(lucros, reverse=True)
+    # As linhas no limite saem da promoção com qualquer ajuste positivo
+    assert lucros[1] == pytest.approx(2.0 * 10 - 10.0 - CUSTO_ENCARTE)
+
+
+def test_varredura_por_sku_no_preco_atual_igual_ao_cenario_base(linhas):
+    varredura = varrer_precos_por_sku(linhas, [0.9, 1.0, 1.1], CUSTO_ENCARTE)
+    base = simular_cenarios(linhas, [1.0], CUSTO_ENCARTE)["Lucro Liquido"][0]
+
+    np.testing.assert_allclose(varredura.loc[1.0].to_numpy(), base)
+
+
+def test_item_a_granel_nao_arredonda_a_ativacao():
+    # 1,2 kg com ativação em 1 kg: um aumento de 10% leva a ~0,99 kg e sai da promoção
+    # (arredondar para 1 manteria a linha ativada)
+    cupons = pd.DataFrame(
+        {
+            "SKU": [1],
+            "Quantidade Comprada": [1.2],
+            "Ativacao Necessaria": [1],
+            "Preco Venda Unidade": [30.0],
+            "Preco Venda Promocao": [25.0],
+            "Custo Produto": [15.0],
+            "Desconto Total": [6.0],
+        }
+    )
+    cenario = simular_cenarios(preparar_linhas(cupons), [1.1], 0.0, elasticidade=-2.0).iloc[0]
+
+    assert cenario["Desconto Total"] == 0.0
+    assert cenario["Lucro Bruto"] == 0.0
@@ -0,0 +1,64 @@
+import pandas as pd
+
+import tests.kpis  # noqa: F401  (coloca a pasta do app no sys.path)
+from config.validacao import REGRAS, validar_cupons
+
+
+def _cupons():
+    # Primeira linha correta; cada uma das demais quebra exatamente uma regra
+    return pd.DataFrame(
+        {
+            "Loja": [1, 1, 2, 2, 3],
+            "Num.Cupom": [10, 11, 12, 13, 14],
+            "SKU": [100, 100, 100, 100, 602907],
+            "Familia": ["ARROZ", "ARROZ", "ARROZ", "ARROZ", "FEIJAO"],
+            "Data Cupom": ["2024-08-01"] * 5,
+            "Preco Venda Unidade": [10.0, 10.0, 10.0, 10.0, 10.0],
+            "Preco Venda Promocao": [9.0, 9.0, 9.0, 9.0, 9.0],
+            "Desconto Unitario": [0.9999999999999987, 1.0, 1.0, 1.5, 1.0],
+            "Desconto Total": [2.0049999, 2.0, 2.0, 3.0, 2.0],
+            "Percentual Desconto": [10.0, 10.0, 75.0, 10.0, 10.0],
+            "Custo Produto": [5.0, 0.0, 5.0, 5.0, 5.0],
+        }
+    )
+
+
+def test_cada_regra_marca_a_linha_certa_e_conta_por_arquivo():
+    resultado = validar_cupons(_cupons(), frozenset({"100"}), "dado_final-08.csv")
+
+    assert resultado["contagem"] == {
+        "Arquivo": "dado_final-08.csv",
+        "Linhas": 5,
+        "custo_invalido": 1,
+        "desconto_atipico": 1,
+        "desconto_inconsistente": 1,
+        "sku_fora_relatorio": 1,
+    }
+    anomalias = resultado["anomalias"].set_index("Regra")
+    assert list(anomalias.index) == list(REGRAS)
+    # Linhas do arquivo: o cabeçalho é a linha 1 e a primeira linha de dados, a 2
+    assert anomalias["Linha"].tolist() == [3, 4, 5, 6]
+    # O SKU fica só na própria coluna (inteiro); Valor segue numérico
+    assert anomalias.loc["sku_fora_relatorio", "SKU"] == 602907
+    assert pd.isna(anomalias.loc["sku_fora_relatorio", "Valor"])
+    assert pd.api.types.is_float_dtype(resultado["anomalias"]["Valor"])
+
+
+def test_carga_arredonda_moeda_e_converte_data_sem_remover_linhas():
+    dados = validar_cupons(_cupons(), frozenset({"100", "602907"}))["dados"]
+
+    assert len(dados) == 5
+    assert dados.loc[0, "Desconto Unitario"] == 1.0
+    assert dados.loc[0, "Desconto Total"] == 2.0
+    assert pd.api.types.is_datetime64_dtype(dados["Data Cupom"])
+
+
+def test_arquivo_vazio_tem_contagem_zerada():
+    resultado = validar_cupons(pd.DataFrame(), frozenset(), "dado_final-01.csv")
+
+    assert resultado["anomalias"].empty
+    assert resultado["contagem"] == {
+        "Arquivo": "dado_final-01.csv",
+        "Linhas": 0,
+        **{regra: 0 for regra in REGRAS},
+    }